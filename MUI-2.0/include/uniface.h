@@ -71,6 +71,7 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 #include <pybind11/numpy.h>
+#include <stdexcept>
 namespace py = pybind11;
 #endif
 
@@ -341,14 +342,40 @@ public:
         auto points_arr = points.template unchecked<2>();
         py::array_t<typename SAMPLER::OTYPE,py::array::c_style> values(points_arr.shape(0));
         auto values_arr = values.template mutable_unchecked<1>();
-        for (ssize_t i = 0; i < points_arr.shape(0); i++) {
-            for (ssize_t j = 0; j < points_arr.shape(1); j++)
-                p[j] = points_arr(i,j);
-            values_arr(i)  = fetch(attr, p, t, sampler, t_sampler, barrier_enabled);
+        {
+            // Only raw views of the arrays are used from here on, so the GIL is let go while the
+            // first fetch waits for the peers and other Python threads can carry on meanwhile
+            py::gil_scoped_release release;
+            for (ssize_t i = 0; i < points_arr.shape(0); i++) {
+                for (ssize_t j = 0; j < points_arr.shape(1); j++)
+                    p[j] = points_arr(i,j);
+                values_arr(i)  = fetch(attr, p, t, sampler, t_sampler, barrier_enabled);
+            }
         }
         return values;
     }
 
+    template<class SAMPLER, class TIME_SAMPLER>
+    void fetch_many_into(const std::string& attr,const py::array_t<REAL,py::array::c_style> points, const time_type t,
+        const SAMPLER &sampler, const TIME_SAMPLER &t_sampler, py::array_t<typename SAMPLER::OTYPE,py::array::c_style> out,
+        bool barrier_enabled = true) {
+        // Same as fetch_many but the values are written straight into the caller's array out,
+        // which has to be writeable and have one entry per point
+        point_type p = 0;
+        auto points_arr = points.template unchecked<2>();
+        if (out.ndim() != 1 || out.shape(0) != points_arr.shape(0))
+            throw std::length_error("fetch_many out array has to have one entry per point.");
+        auto values_arr = out.template mutable_unchecked<1>();
+        {
+            py::gil_scoped_release release;
+            for (ssize_t i = 0; i < points_arr.shape(0); i++) {
+                for (ssize_t j = 0; j < points_arr.shape(1); j++)
+                    p[j] = points_arr(i,j);
+                values_arr(i)  = fetch(attr, p, t, sampler, t_sampler, barrier_enabled);
+            }
+        }
+    }
+
     template<class SAMPLER, class TIME_SAMPLER>
     py::array_t<typename SAMPLER::OTYPE,py::array::c_style>
     fetch_many(const std::string& attr,const py::array_t<REAL,py::array::c_style> points, const time_type t,
@@ -358,10 +385,13 @@ public:
         auto points_arr = points.template unchecked<2>();
         py::array_t<typename SAMPLER::OTYPE,py::array::c_style> values(points_arr.shape(0));
         auto values_arr = values.template mutable_unchecked<1>();
-        for (ssize_t i = 0; i < points_arr.shape(0); i++) {
-            for (ssize_t j = 0; j < points_arr.shape(1); j++)
-                p[j] = points_arr(i,j);
-            values_arr(i)  = fetch(attr, p, t, it, sampler, t_sampler, barrier_enabled);
+        {
+            py::gil_scoped_release release;
+            for (ssize_t i = 0; i < points_arr.shape(0); i++) {
+                for (ssize_t j = 0; j < points_arr.shape(1); j++)
+                    p[j] = points_arr(i,j);
+                values_arr(i)  = fetch(attr, p, t, it, sampler, t_sampler, barrier_enabled);
+            }
         }
         return values;
     }
@@ -375,10 +405,13 @@ public:
         auto points_arr = points.template unchecked<2>();
         py::array_t<typename SAMPLER::OTYPE,py::array::c_style> values(points_arr.shape(0));
         auto values_arr = values.template mutable_unchecked<1>();
-        for (ssize_t i = 0; i < points_arr.shape(0); i++) {
-            for (ssize_t j = 0; j < points_arr.shape(1); j++)
-                p[j] = points_arr(i,j);
-            values_arr(i)  = fetch(attr, p, t, sampler, t_sampler, algorithm, barrier_enabled);
+        {
+            py::gil_scoped_release release;
+            for (ssize_t i = 0; i < points_arr.shape(0); i++) {
+                for (ssize_t j = 0; j < points_arr.shape(1); j++)
+                    p[j] = points_arr(i,j);
+                values_arr(i)  = fetch(attr, p, t, sampler, t_sampler, algorithm, barrier_enabled);
+            }
         }
         return values;
     }
@@ -392,10 +425,13 @@ public:
         auto points_arr = points.template unchecked<2>();
         py::array_t<typename SAMPLER::OTYPE,py::array::c_style> values(points_arr.shape(0));
         auto values_arr = values.template mutable_unchecked<1>();
-        for (ssize_t i = 0; i < points_arr.shape(0); i++) {
-            for (ssize_t j = 0; j < points_arr.shape(1); j++)
-                p[j] = points_arr(i,j);
-            values_arr(i)  = fetch(attr, p, t, it, sampler, t_sampler, algorithm, barrier_enabled);
+        {
+            py::gil_scoped_release release;
+            for (ssize_t i = 0; i < points_arr.shape(0); i++) {
+                for (ssize_t j = 0; j < points_arr.shape(1); j++)
+                    p[j] = points_arr(i,j);
+                values_arr(i)  = fetch(attr, p, t, it, sampler, t_sampler, algorithm, barrier_enabled);
+            }
         }
         return values;
     }
@@ -404,7 +440,11 @@ public:
     template<typename TYPE, class TIME_SAMPLER>
     py::array_t<REAL, py::array::c_style>
     fetch_points_np(const std::string& attr, const time_type t, const TIME_SAMPLER &t_sampler, bool barrier_enabled = true, TYPE test_value = static_cast<TYPE>(0)) {
-        std::vector<point_type> points = fetch_points<TYPE>(attr, t, t_sampler, barrier_enabled);
+        std::vector<point_type> points;
+        {
+            py::gil_scoped_release release;
+            points = fetch_points<TYPE>(attr, t, t_sampler, barrier_enabled);
+        }
         size_t n = points.size();
         test_value += 1;
         py::array_t<REAL, py::array::c_style> points_np({n, static_cast<size_t>(D)});
@@ -418,7 +458,11 @@ public:
     template<typename TYPE, class TIME_SAMPLER>
     py::array_t<REAL, py::array::c_style>
     fetch_points_np(const std::string& attr, const time_type t, const iterator_type it, const TIME_SAMPLER &t_sampler, bool barrier_enabled = true, TYPE test_value = static_cast<TYPE>(0)) {
-        std::vector<point_type> points = fetch_points<TYPE>(attr, t, it, t_sampler, barrier_enabled);
+        std::vector<point_type> points;
+        {
+            py::gil_scoped_release release;
+            points = fetch_points<TYPE>(attr, t, it, t_sampler, barrier_enabled);
+        }
         size_t n = points.size();
         test_value += 1;
         py::array_t<REAL, py::array::c_style> points_np({n, static_cast<size_t>(D)});
@@ -78,7 +78,7 @@ void declare_uniface_fetch(py::class_<mui::uniface<Tconfig>> &uniface)
                   const Tsampler<Tconfig, T, T> &,
                   const Ttemporal<Tconfig> &, bool)) &
                   Tclass::fetch,
-              "");
+              "", py::call_guard<py::gil_scoped_release>());
 }
 
 template <typename Tconfig, typename T, template <typename, typename, typename> class Tsampler, template <typename> class Ttemporal>
@@ -99,7 +99,7 @@ void declare_uniface_fetch_dual(py::class_<mui::uniface<Tconfig>> &uniface)
                const Tsampler<Tconfig, T, T> &,
                const Ttemporal<Tconfig> &, bool)) &
                Tclass::fetch,
-           "");
+           "", py::call_guard<py::gil_scoped_release>());
 }
 
 template <typename Tconfig, typename T, template <typename, typename, typename> class Tsampler, template <typename> class Ttemporal>
@@ -119,6 +119,20 @@ void declare_uniface_fetch_many(py::class_<mui::uniface<Tconfig>> &uniface)
                   const Ttemporal<Tconfig> &, bool)) &
                   Tclass::fetch_many,
               "");
+
+  // out is not converted, an array of another type or layout is refused instead of being written into a copy
+  std::string fetch_many_into_name = "fetch_many_into_" + type_name<T>() + "_" + sampler_name<Tconfig, T, Tsampler>() + "_" + temporal_sampler_name<Tconfig, Ttemporal>();
+  uniface.def(fetch_many_into_name.c_str(),
+              (void(Tclass::*)(
+                  const std::string &,
+                  const py::array_t<Treal, py::array::c_style>,
+				  const Ttime,
+                  const Tsampler<Tconfig, T, T> &,
+                  const Ttemporal<Tconfig> &,
+                  py::array_t<T, py::array::c_style>, bool)) &
+                  Tclass::fetch_many_into,
+              "", py::arg("attr"), py::arg("points"), py::arg("t"), py::arg("sampler"), py::arg("t_sampler"),
+              py::arg("out").noconvert(), py::arg("barrier_enabled"));
 }
 
 template <typename Tconfig, typename T, template <typename, typename, typename> class Tsampler, template <typename> class Ttemporal>
@@ -161,7 +175,7 @@ void declare_uniface_fetch_algo(py::class_<mui::uniface<Tconfig>> &uniface)
                   const Talgorithm<Tconfig> &,
 				  bool)) &
                   Tclass::fetch,
-              "");
+              "", py::call_guard<py::gil_scoped_release>());
 }
 
 template <typename Tconfig, typename T, template <typename, typename, typename> class Tsampler, template <typename> class Ttemporal, template <typename> class Talgorithm>
@@ -184,7 +198,7 @@ void declare_uniface_fetch_algo_dual(py::class_<mui::uniface<Tconfig>> &uniface)
 			   const Talgorithm<Tconfig> &,
 			   bool)) &
                Tclass::fetch,
-           "");
+           "", py::call_guard<py::gil_scoped_release>());
 }
 
 template <typename Tconfig, typename T, template <typename, typename, typename> class Tsampler, template <typename> class Ttemporal, template <typename> class Talgorithm>
@@ -283,7 +297,7 @@ void declare_uniface_fetch_values(py::class_<mui::uniface<Tconfig>> &uniface)
                   const Ttemporal<Tconfig> &,
 				  bool)) &
                   Tclass::fetch_values,
-              "");
+              "", py::call_guard<py::gil_scoped_release>());
 }
 
 template <typename Tconfig, typename T, template <typename> class Ttemporal>
@@ -302,7 +316,7 @@ void declare_uniface_fetch_values_dual(py::class_<mui::uniface<Tconfig>> &unifac
                   const Ttemporal<Tconfig> &,
 				  bool)) &
                   Tclass::fetch_values,
-              "");
+              "", py::call_guard<py::gil_scoped_release>());
 }
 
 
@@ -478,17 +492,20 @@ void declare_uniface_class (py::module &m)
   using Titer = typename Tconfig::iterator_type;
   py::class_<Tclass> uniface(m, name.c_str());
 
+  // The calls that can block on the peers run without the GIL (call_guard here, a scoped release inside
+  // the numpy based fetches of uniface.h), a uniface itself is still meant to be used by one thread at a time
+
   uniface
-      .def("commit", (int(Tclass::*)(Ttime, Titer)) & Tclass::commit, "")
-      .def("forecast", (void(Tclass::*)(Ttime, Titer)) & Tclass::forecast, "")
+      .def("commit", (int(Tclass::*)(Ttime, Titer)) & Tclass::commit, "", py::call_guard<py::gil_scoped_release>())
+      .def("forecast", (void(Tclass::*)(Ttime, Titer)) & Tclass::forecast, "", py::call_guard<py::gil_scoped_release>())
       .def("is_ready", (bool(Tclass::*)(const std::string &, Ttime) const) &Tclass::is_ready, "")
       .def("is_ready", (bool(Tclass::*)(const std::string &, Ttime, Titer) const) &Tclass::is_ready, "")
-      .def("barrier", (void(Tclass::*)(Ttime)) & Tclass::barrier, "")
-      .def("barrier", (void(Tclass::*)(Ttime, Titer)) & Tclass::barrier, "")
-      .def("forget", (void(Tclass::*)(Ttime, bool)) & Tclass::forget, "")
-      .def("forget", (void(Tclass::*)(std::pair<Ttime,Titer>, bool)) & Tclass::forget, "")
-      .def("forget", (void(Tclass::*)(Ttime, Ttime, bool)) & Tclass::forget, "")
-      .def("forget", (void(Tclass::*)(std::pair<Ttime,Titer>, std::pair<Ttime,Titer>, bool)) & Tclass::forget, "")
+      .def("barrier", (void(Tclass::*)(Ttime)) & Tclass::barrier, "", py::call_guard<py::gil_scoped_release>())
+      .def("barrier", (void(Tclass::*)(Ttime, Titer)) & Tclass::barrier, "", py::call_guard<py::gil_scoped_release>())
+      .def("forget", (void(Tclass::*)(Ttime, bool)) & Tclass::forget, "", py::call_guard<py::gil_scoped_release>())
+      .def("forget", (void(Tclass::*)(std::pair<Ttime,Titer>, bool)) & Tclass::forget, "", py::call_guard<py::gil_scoped_release>())
+      .def("forget", (void(Tclass::*)(Ttime, Ttime, bool)) & Tclass::forget, "", py::call_guard<py::gil_scoped_release>())
+      .def("forget", (void(Tclass::*)(std::pair<Ttime,Titer>, std::pair<Ttime,Titer>, bool)) & Tclass::forget, "", py::call_guard<py::gil_scoped_release>())
       .def("set_memory", (void(Tclass::*)(Ttime)) & Tclass::set_memory, "")
       .def("uri_host", (std::string(Tclass::*)()) & Tclass::uri_host, "")
       .def("uri_path", (std::string(Tclass::*)()) & Tclass::uri_path, "")
@@ -506,9 +523,9 @@ void declare_uniface_class (py::module &m)
       .def("update_smart_send",
            (void(Tclass::*)(Ttime)) & Tclass::update_smart_send, "")
       .def("barrier_ss_send",
-           (void(Tclass::*)()) & Tclass::barrier_ss_send, "")
+           (void(Tclass::*)()) & Tclass::barrier_ss_send, "", py::call_guard<py::gil_scoped_release>())
       .def("barrier_ss_recv",
-           (void(Tclass::*)()) & Tclass::barrier_ss_recv, "")
+           (void(Tclass::*)()) & Tclass::barrier_ss_recv, "", py::call_guard<py::gil_scoped_release>())
       .def(py::init<const std::string &>());
 
   declare_uniface_string<Tconfig> (uniface);
@@ -54,6 +54,10 @@ from mui4py.samplers import Sampler
 from mui4py.temporal_samplers import TemporalSampler
 from mui4py.algorithms import Algorithm,AlgorithmAitken,AlgorithmFixedRelaxation
 import copy
+import numpy as np
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
 
 
 def create_unifaces(domain, ifaces_names, config, world=None):
@@ -99,6 +103,9 @@ def set_data_types_unifaces(ifaces, data):
 
 # MUI Classes
 class Uniface(CppClass):
+    # The blocking C++ calls (commit, barrier, forget, fetch*) run without the GIL. Only one thread at a time
+    # may use a Uniface and the arrays handed to a call must not change until it returns; separate Unifaces
+    # can be driven from separate threads when MPI provides MPI_THREAD_MULTIPLE.
     def __init__(self, uri=None, cpp_obj=None, config=None):
         super(Uniface, self).__init__(config, args=(uri,))
         self.uri = uri
@@ -118,6 +125,8 @@ class Uniface(CppClass):
         self._fixed_relaxation_residual_l2_norm = []
         self._latest_fixed_relaxation_under_relaxation_factor = 0.0
         self._latest_fixed_relaxation_residual_l2_norm = 0.0
+        # thread that runs the *_async calls, created by the first one
+        self._waiter = None
 
     def _get_tag_type(self, tag):
         try:
@@ -192,12 +201,93 @@ class Uniface(CppClass):
         push_fname, data_type = self._get_pushfname("push_many_", tag, type_in=values.dtype.type)
         getattr(self.raw, push_fname)(tag, points, values)
 
+    # Bulk version of push(tag, point, value) for a whole set of points: the checks push() does for every
+    # single value are done once for the arrays. points has to be a C-contiguous (N, dim) array of the config's
+    # float type and is handed to C++ as it is (no copy), values a length N array of the tag's data type
+    # (with force_casting any type that can be safely cast to it, converted once for the whole array).
+    def push_points(self, tag, points, values):
+        if not isinstance(points, np.ndarray) or not isinstance(values, np.ndarray):
+            raise Exception("MUI Error [mui4py.py]: push_points() takes numpy arrays for points and values.")
+        if points.ndim != 2 or points.shape[1] != self.config.dim:
+            raise Exception("Points of shape {} do not match (N, {}) for the uniface dimensions.".format(points.shape, self.config.dim))
+        if points.dtype != self.config.float_type:
+            raise Exception("Points of type '{}' do not match the uniface float type '{}'.".format(points.dtype, np.dtype(self.config.float_type)))
+        if not points.flags.c_contiguous:
+            raise Exception("Points have to be a C-contiguous array.")
+        if values.shape != (points.shape[0],):
+            raise Exception("Values of shape {} do not match {} points.".format(values.shape, points.shape[0]))
+        data_type = map_type[self._get_tag_type(tag)]
+        if values.dtype != data_type:
+            if not self.config.force_casting:
+                raise Exception("Data type set for tag '{}' do not match with the "
+                                "data type of the values provided.".format(tag))
+            if not np.can_cast(values.dtype, data_type):
+                raise Exception("Values of type '{}' cannot be safely casted to type '{}'.".format(values.dtype, data_type.__name__))
+            values = values.astype(data_type)
+        getattr(self.raw, "push_many_" + ALLOWED_IO_TYPES[data_type])(tag, points, values)
+
+    # Prepared handles resolve the C++ function for a tag (and samplers) once, so calling them every
+    # timestep skips the type checks, sampler lookups and name formatting of push_many()/fetch_many():
+    #    ```
+    #    push = uniface.prepare_push_many("temp")
+    #    fetch = uniface.prepare_fetch_many("temp", mui4py.SamplerExact(), mui4py.TemporalSamplerExact())
+    #    push(points, values)
+    #    values = fetch(points, t)
+    #    fetch(points, t, out=values)
+    #    ```
+    # Arrays passed to the handles must already have the tag's data type, see fetch_many() for out.
+    def prepare_push_many(self, tag):
+        data_type = map_type[self._get_tag_type(tag)]
+        push = getattr(self.raw, "push_many_" + ALLOWED_IO_TYPES[data_type])
+
+        def push_many(points, values):
+            push(tag, points, values)
+        return push_many
+
+    def prepare_fetch_many(self, tag, spatial_sampler, temporal_sampler):
+        data_type = map_type[self._get_tag_type(tag)]
+        fetch_fname, ss, cs = self._get_fetch_args("fetch_many", tag, data_type,
+                                                   spatial_sampler, temporal_sampler)
+        fetch = getattr(self.raw, fetch_fname)
+        fetch_into = getattr(self.raw, self._tags_fetch[tag][("fetch_many_into", cs.signature, ss.signature)])
+        ss_raw = ss.raw
+        cs_raw = cs.raw
+
+        def fetch_many(points, time, out=None, barrier_enabled=True):
+            if out is None:
+                return fetch(tag, points, time, ss_raw, cs_raw, barrier_enabled)
+            fetch_into(tag, points, time, ss_raw, cs_raw, out, barrier_enabled)
+            return out
+        return fetch_many
+
     def commit(self, t1, t2=None):
         if t2 is not None:
             return self.raw.commit(t1, t2)
         else:
             return self.raw.commit(t1, mui4py_mod.numeric_limits_uint)
 
+    # asyncio versions of commit() and fetch_many(), taking the same arguments:
+    #    ```
+    #    left, right = await asyncio.gather(left_iface.fetch_many_async(tag, points, t, ss, ts),
+    #                                       right_iface.fetch_many_async(tag, points, t, ss, ts))
+    #    ```
+    # The calls go to a single waiter thread per Uniface, where the C++ side waits for the peers
+    # without the GIL. The fetches of several Unifaces awaited together then wait at the same time,
+    # while each Uniface still only sees one thread. Don't mix them with plain calls to the same
+    # Uniface that is still awaited, and awaiting several Unifaces needs MPI_THREAD_MULTIPLE.
+    # run_async(func, ...) runs any other call for this Uniface on the same waiter thread, e.g. a
+    # handle from prepare_fetch_many(): await iface.run_async(handle, points, t, out=buf)
+    def run_async(self, func, *args, **kwargs):
+        if self._waiter is None:
+            self._waiter = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mui4py-waiter")
+        return asyncio.get_running_loop().run_in_executor(self._waiter, functools.partial(func, *args, **kwargs))
+
+    async def commit_async(self, t1, t2=None):
+        return await self.run_async(self.commit, t1, t2)
+
+    async def fetch_many_async(self, *args, **kwargs):
+        return await self.run_async(self.fetch_many, *args, **kwargs)
+
     def forecast(self, t1, t2=None):
         if t2 is not None:
             self.raw.forecast(t1, t2)
@@ -299,6 +389,10 @@ class Uniface(CppClass):
                 "fetch_many_{}_{}_{}".format(ALLOWED_IO_TYPES[data_type],
                                              ss.fetch_signature(),
                                              cs.fetch_signature())
+            self._tags_fetch[tag][("fetch_many_into", cs.signature, ss.signature)] = \
+                "fetch_many_into_{}_{}_{}".format(ALLOWED_IO_TYPES[data_type],
+                                                  ss.fetch_signature(),
+                                                  cs.fetch_signature())
             self._tags_fetch[tag][("fetch_dual", cs.signature, ss.signature)] = \
                     "{}_{}_{}_{}".format("fetch_dual",
                                          ALLOWED_IO_TYPES[data_type],
@@ -436,16 +530,28 @@ class Uniface(CppClass):
         else:
             raise Exception("MUI Error [mui4py.py]: fetch_values() can only take 5 or 6 args")
 
+    # With out=array (5 args only) the values are written straight into that array, which is returned,
+    # instead of into a new one. It has to be a writeable C-contiguous array of the tag's data type
+    # with one entry per point.
     def fetch_many(self, *args, **kwargs):
         tag = args[0]
         points = args[1]
         time = args[2]
+        out = kwargs.get("out")
+        if out is not None and len(args) != 5:
+            raise Exception("MUI Error [mui4py.py]: fetch_many() only takes out= with 5 args (no iteration or coupling algorithm)")
         if len(args) == 5:
             spatial_sampler = args[3]
             temporal_sampler = args[4]
+            barrier_enabled = True
+            if out is not None:
+                fetch_fname, ss, cs = self._get_fetch_args("fetch_many_into", tag, points.dtype.type,
+                                                            spatial_sampler, temporal_sampler)
+                fetch = getattr(self.raw, fetch_fname)
+                fetch(tag, points, time, ss.raw, cs.raw, out, barrier_enabled)
+                return out
             fetch_fname, ss, cs = self._get_fetch_args("fetch_many", tag, points.dtype.type,
                                                         spatial_sampler, temporal_sampler)
-            barrier_enabled = True
             fetch = getattr(self.raw, fetch_fname)
             return fetch(tag, points, time, ss.raw, cs.raw, barrier_enabled)
         elif len(args) == 6:
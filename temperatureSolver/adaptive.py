@@ -0,0 +1,74 @@
+import numpy as np
+from temperatureSolver.implicit import ImplicitIntegrator
+
+
+class AdaptiveIntegrator:
+    # Backward Euler with a local truncation error controller.
+    # Every step is also taken with Crank-Nicolson from the same field and ghost rows; the difference
+    # estimates the local error of backward Euler (O(dt^2)), so dt grows as the transient decays.
+    # The largest error over all solvers is found with an allreduce, so every solver accepts/rejects
+    # the same steps and always agrees on dt (and on the MUI time). A rejected step is retried with the
+    # ghost rows already fetched, so there is no extra exchange.
+    # dt is kept to baseDt*2^k so each size is only factorised once.
+
+    def __init__(self, solver, linearSolver='direct', tolerance=1e-2):
+        self.tolerance = tolerance # largest accepted local error (K)
+        self.safety = 0.9
+        self.maxGrowth = 4.0
+        self.minLevel = -4
+        self.maxLevel = 20
+
+        self.linearSolver = linearSolver
+        self.baseDt = solver.dt
+        self.proposedDt = solver.dt
+        self.steps = 0
+        self.rejected = 0
+
+        self.nodes = solver.nodes
+        self.ghostPrev = np.zeros(self.nodes)
+        self.ghostNext = np.zeros(self.nodes)
+
+        # dt -> (backward Euler, Crank-Nicolson)
+        self.integrators = {}
+
+    def quantise(self, dt):
+        level = int(np.floor(np.log2(dt/self.baseDt)))
+        return self.baseDt*2.0**min(max(level, self.minLevel), self.maxLevel)
+
+    def getIntegrators(self, solver, dt):
+        if dt not in self.integrators:
+            self.integrators[dt] = (ImplicitIntegrator(solver, 'backwardEuler', self.linearSolver),
+                                    ImplicitIntegrator(solver, 'crankNicolson', self.linearSolver))
+        return self.integrators[dt]
+
+    def trialStep(self, solver, dt):
+        # both integrators read dt from the solver
+        solver.dt = dt
+        backwardEuler, crankNicolson = self.getIntegrators(solver, dt)
+        for integrator in (backwardEuler, crankNicolson):
+            np.copyto(integrator.ghostPrev, self.ghostPrev)
+            np.copyto(integrator.ghostNext, self.ghostNext)
+        T = backwardEuler.step(solver)
+        error = np.max(np.abs(T - crankNicolson.step(solver)))
+        return T, solver.mui.maxAcrossSolvers(error)
+
+    def step(self, solver, time, endTime):
+        # returns the new field and leaves the size of the step taken in solver.dt
+        dt = self.proposedDt
+        # don't overshoot the end of the simulation, but stay on the dt grid so the operators already
+        # factorised are used and a restart takes the same steps: the largest grid step that fits
+        # (allowing for rounding in the accumulated time), the smallest one if even that is too long
+        if time + dt > endTime and endTime > time:
+            dt = self.quantise((endTime - time)*(1 + 1e-9))
+
+        while True:
+            T, error = self.trialStep(solver, dt)
+            factor = self.safety*np.sqrt(self.tolerance/max(error, 1e-300))
+            if error <= self.tolerance or dt <= self.baseDt*2.0**self.minLevel:
+                break
+            self.rejected += 1
+            dt = self.quantise(dt*max(factor, 0.25))
+
+        self.steps += 1
+        self.proposedDt = self.quantise(dt*min(factor, self.maxGrowth))
+        return T
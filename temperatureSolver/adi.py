@@ -0,0 +1,133 @@
+import numpy as np
+from temperatureSolver.stencil import diagonalX, diagonalY
+
+# numba is optional, without it the tridiagonal sweeps are vectorised with numpy
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+
+def factoriseTridiagonal(diag, offDiag):
+    # Thomas algorithm elimination for a tridiagonal matrix with constant off diagonals.
+    # The matrix is the same for every row/column of the grid, so this is done once and
+    # the returned factors are applied to a whole batch of right hand sides.
+    n = len(diag)
+    upper = np.zeros(n)
+    invPivot = np.zeros(n)
+    invPivot[0] = 1/diag[0]
+    upper[0] = offDiag*invPivot[0]
+    for i in range(1, n):
+        invPivot[i] = 1/(diag[i] - offDiag*upper[i-1])
+        upper[i] = offDiag*invPivot[i]
+    return upper, invPivot
+
+
+def solveTridiagonalNumpy(offDiag, upper, invPivot, rhs):
+    # solves along axis 0 for every column of rhs at once, in place
+    n = rhs.shape[0]
+    rhs[0] *= invPivot[0]
+    for i in range(1, n):
+        rhs[i] -= offDiag*rhs[i-1]
+        rhs[i] *= invPivot[i]
+    for i in range(n-2, -1, -1):
+        rhs[i] -= upper[i]*rhs[i+1]
+
+
+def solveTridiagonalCompiled(offDiag, upper, invPivot, rhs, blockSize=64):
+    # same sweeps as solveTridiagonalNumpy, blocks of columns are independent so they are split between threads
+    n = rhs.shape[0]
+    numColumns = rhs.shape[1]
+    numBlocks = (numColumns + blockSize - 1)//blockSize
+    for block in prange(numBlocks):
+        colStart = block*blockSize
+        colEnd = min(colStart + blockSize, numColumns)
+        for k in range(colStart, colEnd):
+            rhs[0, k] *= invPivot[0]
+        for i in range(1, n):
+            for k in range(colStart, colEnd):
+                rhs[i, k] = (rhs[i, k] - offDiag*rhs[i-1, k])*invPivot[i]
+        for i in range(n-2, -1, -1):
+            for k in range(colStart, colEnd):
+                rhs[i, k] -= upper[i]*rhs[i+1, k]
+
+
+if njit is not None:
+    solveTridiagonalCompiled = njit(parallel=True, cache=True)(solveTridiagonalCompiled)
+
+
+def applySecondDifference(diag, T, out):
+    # out = D T along axis 0, D has the given diagonal and ones on the off diagonals
+    np.multiply(diag[:, None], T, out=out)
+    out[1:] += T[:-1]
+    out[:-1] += T[1:]
+
+
+class ADIIntegrator:
+    # Peaceman-Rachford alternating direction implicit scheme
+    #   (I - dt/2 Ax) T*      = (I + dt/2 Ay) T^n + dt/2 b
+    #   (I - dt/2 Ay) T^{n+1} = (I + dt/2 Ax) T*  + dt/2 b
+    # Ax and Ay are the x and y parts of the explicit stencil (including the interface alpha rows and the
+    # flux BC), so each half step is a batch of nodes independent tridiagonal solves.
+    # Like ImplicitIntegrator the ghost rows in b are lagged by one step.
+
+    def __init__(self, solver):
+        self.nodes = solver.nodes
+        self.ghostPrev = np.zeros(self.nodes)
+        self.ghostNext = np.zeros(self.nodes)
+
+        self.work = np.zeros((self.nodes, self.nodes))
+        self.workT = np.zeros((self.nodes, self.nodes))
+
+        if njit is not None:
+            self.solveTridiagonal = solveTridiagonalCompiled
+        else:
+            self.solveTridiagonal = solveTridiagonalNumpy
+
+        self.boundaryType = None
+        self.dt = None
+
+    def factorise(self, solver):
+        halfDt = solver.dt/2
+        self.ax = solver.alpha/solver.dx**2
+        self.ay = solver.alpha/solver.dy**2
+
+        self.diagX = diagonalX(solver)
+        self.diagY = diagonalY(self.nodes)
+
+        self.offX = -halfDt*self.ax
+        self.offY = -halfDt*self.ay
+        self.upperX, self.invPivotX = factoriseTridiagonal(1 - halfDt*self.ax*self.diagX, self.offX)
+        self.upperY, self.invPivotY = factoriseTridiagonal(1 - halfDt*self.ay*self.diagY, self.offY)
+
+        self.boundaryType = getattr(solver, 'boundaryType', None)
+        self.dt = solver.dt
+
+    def step(self, solver):
+        # only the first solver has a boundary condition
+        if getattr(solver, 'boundaryType', None) != self.boundaryType or solver.dt != self.dt:
+            self.factorise(solver)
+
+        halfDt = solver.dt/2
+        ghostScale = halfDt*self.ax
+
+        # first half step: explicit in y, implicit in x (solves along axis 0)
+        rhs = self.work
+        applySecondDifference(self.diagY, solver.T.T, self.workT)
+        np.multiply(self.workT.T, halfDt*self.ay, out=rhs)
+        rhs += solver.T
+        rhs[0] += ghostScale*self.ghostPrev
+        rhs[-1] += ghostScale*self.ghostNext
+        self.solveTridiagonal(self.offX, self.upperX, self.invPivotX, rhs)
+
+        # second half step: explicit in x, implicit in y (solves along axis 1, done on the transpose)
+        rhsT = self.workT
+        applySecondDifference(self.diagX, rhs, rhsT.T)
+        rhsT *= halfDt*self.ax
+        rhsT += rhs.T
+        rhsT[:, 0] += ghostScale*self.ghostPrev
+        rhsT[:, -1] += ghostScale*self.ghostNext
+        self.solveTridiagonal(self.offY, self.upperY, self.invPivotY, rhsT)
+
+        return rhsT.T
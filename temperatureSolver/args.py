@@ -7,6 +7,7 @@ class Args():
         parser.add_argument('--height', type=float, default=1.0)
         parser.add_argument('--length', type=float, default=0.05)
         parser.add_argument('--alpha', type=float, default=1.27e-4)
+        parser.add_argument('--restart', type=str, default=None) # checkpoint directory to carry on from
         
         self.args = parser.parse_args()
         
\ No newline at end of file
@@ -0,0 +1,40 @@
+from temperatureSolver.heat2d import Heat2d
+import time
+
+
+# Wall time to solution of case2 (one layer, 40s) with the explicit integrator and with RKL2
+# super time stepping. Running 40s of the explicit integrator at 1000 nodes takes days, so every
+# configuration is timed over a few steps and the time to reach 40s is extrapolated from that.
+# python3 -m temperatureSolver.benchmark.main
+
+simulationTime = 40
+configurations = [('explicit', None, 100), ('rkl2', 10, 5), ('rkl2', 20, 5), ('rkl2', 40, 5)]
+
+print("{:>6} {:>10} {:>7} {:>12} {:>12} {:>16} {:>8}".format(
+    "nodes", "integrator", "stages", "dt", "ms/step", "time to 40s (s)", "speedup"))
+
+for nodes in [100, 400, 1000]:
+    explicitTime = None
+    for integrator, stages, steps in configurations:
+        if stages is None:
+            solver = Heat2d(time=simulationTime, nodes=nodes, integrator=integrator)
+        else:
+            solver = Heat2d(time=simulationTime, nodes=nodes, integrator=integrator, stages=stages)
+        solver.initialiseTempField(0)
+
+        # one untimed step so setup costs are not counted
+        solver.calculateHeatEquation(0)
+        i = solver.dt
+
+        startTime = time.time()
+        for step in range(steps):
+            solver.calculateHeatEquation(i)
+            i += solver.dt
+        stepTime = (time.time() - startTime)/steps
+
+        timeToSolution = stepTime*simulationTime/solver.dt
+        if explicitTime is None:
+            explicitTime = timeToSolution
+        print("{:>6d} {:>10} {:>7} {:>12.3e} {:>12.3f} {:>16.1f} {:>7.1f}x".format(
+            nodes, integrator, "-" if stages is None else str(stages), solver.dt, stepTime*1000,
+            timeToSolution, explicitTime/timeToSolution))
@@ -5,20 +5,16 @@ import time
 
 # define temperature solver
 # length, width, time, nodes(mesh res), alpha
-solver = Heat2d(time=20.0, nodes=100)
+# adaptive dt: small steps while the transient is fast, large ones near equilibrium
+solver = Heat2d(time=20.0, nodes=100, integrator='adaptive')
 
 
 # Solver loop
-i = 0
-
 print("Starting timer, timestep : {:.2f}".format(solver.dt))
 startTime = time.time()
-while i < solver.time:
-
-    solver.calculateHeatEquationWithNumpy(i)
-    i += solver.dt
+steps = solver.run()
 
 runtime= time.time()-startTime
-print("loop took {:.3f}".format(runtime))
+print("loop took {:.3f} for {:d} steps".format(runtime, steps))
 
 solver.plotTemperature()
\ No newline at end of file
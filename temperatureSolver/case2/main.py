@@ -1,24 +1,25 @@
 from temperatureSolver.heat2d import Heat2d
+from temperatureSolver.checkpoint import CheckpointWriter
 import time
 
 
 # define temperature solver
 # height, width, time, nodes(mesh res), alpha
 
-solver = Heat2d(time = 40, nodes=100)
+# adaptive dt: small steps while the transient is fast, large ones near equilibrium
+solver = Heat2d(time = 40, nodes=100, integrator='adaptive')
 
 
-# Solver loop
-i = 0
+# checkpoint every 100 steps, resume a stopped run with --restart checkpoints
+checkpoints = CheckpointWriter(solver, 'checkpoints')
 
+# Solver loop
 print("Starting timer, timestep : {:.2f}".format(solver.dt))
 startTime = time.time()
-while i < solver.time:
-    solver.calculateHeatEquation(i, animate=False)
-    i += solver.dt
-    
+steps = solver.run(callbackEvery=100, callbacks=[checkpoints])
+checkpoints.close()
 
 runtime= time.time()-startTime
-print("loop took {:.3f}".format(runtime))
+print("loop took {:.3f} for {:d} steps".format(runtime, steps))
 
 solver.plotTemperature()
\ No newline at end of file
@@ -5,23 +5,20 @@ import time
 # define temperature solver
 # height, width, time, nodes(mesh res), alpha
 
-solver = Heat2d(time = 30, nodes=100)
+# adaptive dt: small steps while the transient is fast, large ones near equilibrium
+# every solver has 100 nodes, so the rows are exchanged directly over MPI instead of through MUI's samplers
+solver = Heat2d(time = 30, nodes=100, integrator='adaptive', transport='mpi')
 
 
 
 solver.setBoundaryCondition('flux', 848000)
 
 # Solver loop
-i = 0
-
 print("Starting timer, timestep : {:.2f}".format(solver.dt))
 startTime = time.time()
-while i < solver.time:
-    solver.calculateHeatEquationWithNumpy(i)
-    i += solver.dt
-    
+steps = solver.run()
 
 runtime= time.time()-startTime
-print("loop took {:.3f}".format(runtime))
+print("loop took {:.3f} for {:d} steps".format(runtime, steps))
 
 solver.plotTemperature()
\ No newline at end of file
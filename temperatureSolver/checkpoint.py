@@ -0,0 +1,71 @@
+import numpy as np
+import glob
+import os
+import re
+import threading
+
+
+# Checkpoints of a Heat2d run, one file per solver (rank) and step: <directory>/solver<N>_step<k>.npz
+# holding the state from Heat2d.getState. The last `keep` checkpoints of every solver are kept, so if a
+# rank dies while writing, the solvers can still agree on an older step that all of them have.
+
+
+def checkpointPath(directory, solverNum, step):
+    return os.path.join(directory, "solver{:d}_step{:d}.npz".format(solverNum, step))
+
+
+def checkpointSteps(directory, solverNum):
+    # steps with a complete checkpoint for this solver, oldest first
+    steps = []
+    for path in glob.glob(os.path.join(directory, "solver{:d}_step*.npz".format(solverNum))):
+        match = re.search(r"_step(\d+)\.npz$", path)
+        if match:
+            steps.append(int(match.group(1)))
+    return sorted(steps)
+
+
+def saveCheckpoint(path, state):
+    # written next to the final file and renamed, so a half written checkpoint is never loaded
+    with open(path + ".tmp", 'wb') as f:
+        np.savez(f, **state)
+    os.replace(path + ".tmp", path)
+
+
+def loadCheckpoint(path):
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files}
+
+
+class CheckpointWriter:
+    # Use as a Heat2d.run callback, e.g. solver.run(callbackEvery=100, callbacks=[CheckpointWriter(solver)])
+    # The solver thread only copies the state, the file is written by a background thread. If the previous
+    # checkpoint is still being written the next one waits for it.
+
+    def __init__(self, solver, directory='checkpoints', keep=2):
+        self.solverNum = solver.solverNum
+        self.directory = directory
+        self.keep = keep
+        self.thread = None
+        os.makedirs(directory, exist_ok=True)
+
+    def __call__(self, solver, step, time):
+        self.write(solver)
+
+    def write(self, solver):
+        state = solver.getState()
+        self.wait()
+        self.thread = threading.Thread(target=self.save, args=(state,))
+        self.thread.start()
+
+    def save(self, state):
+        saveCheckpoint(checkpointPath(self.directory, self.solverNum, int(state['step'])), state)
+        for step in checkpointSteps(self.directory, self.solverNum)[:-self.keep]:
+            os.remove(checkpointPath(self.directory, self.solverNum, step))
+
+    def wait(self):
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def close(self):
+        self.wait()
@@ -0,0 +1,53 @@
+from temperatureSolver.heat2d import Heat2d
+import numpy as np
+import sys
+
+
+# Coupling check: besides temp every solver couples one extra field, 'flux', and counts the commits
+# on its unifaces. temp and flux go in the same commit, so there has to be one commit per neighbour
+# per step, and the flux rows fetched have to be the ones the neighbours set for that step. Run with
+# mpirun -np 3 python3 -m temperatureSolver.coupling.main
+
+solver = Heat2d(time=1.0, nodes=20, fields=('flux',))
+steps = 50
+
+if solver.numSolvers == 1:
+    print("The coupling check needs at least 2 solvers.")
+    sys.exit(1)
+
+commits = {}
+
+
+def countCommits(side, uniface):
+    commit = uniface.commit
+    commits[side] = 0
+
+    def countedCommit(*args, **kwargs):
+        commits[side] += 1
+        return commit(*args, **kwargs)
+    uniface.commit = countedCommit
+
+
+if solver.xNum > 0:
+    countCommits('left', solver.mui.leftUniface)
+if solver.xNum != solver.numX-1:
+    countCommits('right', solver.mui.rightUniface)
+
+failed = False
+for step in range(steps):
+    # a different value on every solver and step, so a stale or mixed up row shows
+    solver.coupledFields['flux'][:, :] = 1000*solver.solverNum + step
+    solver.calculateHeatEquation(step*solver.dt)
+
+    for row, neighbour in ((0, solver.solverNum-1), (1, solver.solverNum+1)):
+        if 0 <= neighbour < solver.numSolvers and np.any(solver.fieldGhostRows['flux'][row] != 1000*neighbour + step):
+            failed = True
+
+for side, count in commits.items():
+    print("Solver {:d}: {:d} commits to the {} neighbour in {:d} steps".format(solver.solverNum, count, side, steps))
+    if count != steps:
+        failed = True
+if failed:
+    print("Solver {:d}: coupling check failed".format(solver.solverNum))
+
+sys.exit(1 if failed else 0)
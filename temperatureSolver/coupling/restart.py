@@ -0,0 +1,34 @@
+from temperatureSolver.heat2d import Heat2d
+from temperatureSolver.checkpoint import CheckpointWriter, checkpointPath, checkpointSteps
+import numpy as np
+import os
+import sys
+
+
+# Restart check: a chain of solvers restarted from a checkpoint halfway has to end with exactly the
+# same field as the uninterrupted run. Run it twice, the second time carrying on from the checkpoint:
+# mpirun -np 3 python3 -m temperatureSolver.coupling.restart
+# mpirun -np 3 python3 -m temperatureSolver.coupling.restart --restart restartCheck
+
+directory = 'restartCheck'
+solver = Heat2d(time=2.0, nodes=20)
+referencePath = os.path.join(directory, "reference{:d}.npy".format(solver.solverNum))
+
+if solver.restartDirectory is None:
+    # uninterrupted run, with a single checkpoint halfway
+    for step in checkpointSteps(directory, solver.solverNum):
+        os.remove(checkpointPath(directory, solver.solverNum, step))
+    checkpoints = CheckpointWriter(solver, directory)
+    solver.run(tEnd=solver.time/2, callbacks=[checkpoints])
+    checkpoints.close()
+    solver.run()
+    np.save(referencePath, solver.T)
+    if solver.solverNum == 0:
+        print("Reference written, now run again with --restart " + directory)
+    sys.exit(0)
+
+solver.run()
+error = np.max(np.abs(solver.T - np.load(referencePath)))
+print("Solver {:d}: restarted run max difference from the uninterrupted run {:.3e}".format(solver.solverNum, error))
+
+sys.exit(1 if error > 0 else 0)
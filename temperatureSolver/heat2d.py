@@ -1,10 +1,17 @@
 import numpy as np
-import matplotlib.pyplot as plt
+import sys
 from temperatureSolver.args import Args
 from temperatureSolver.mui import MUI
+from temperatureSolver.kernels import InPlaceKernel, ThreadedKernel, FusedKernel
+from temperatureSolver.implicit import ImplicitIntegrator, SteadyStateSolver
+from temperatureSolver.adi import ADIIntegrator
+from temperatureSolver.adaptive import AdaptiveIntegrator
+from temperatureSolver.rkl import RKLIntegrator, superStepDt
+from temperatureSolver.visualisation import Visualisation, AsyncFrameWriter
+from temperatureSolver.checkpoint import checkpointPath, checkpointSteps, loadCheckpoint
 
 class Heat2d:
-    def __init__(self, time=1.0, nodes=40):
+    def __init__(self, time=1.0, nodes=40, backend='numpy', integrator='explicit', dt=None, linearSolver='direct', stages=10, transport='mui', grid=None, threads=None, fields=(), interfaceMemory=('frames', 10)):
         # Parse solver arguments
         args = Args().args
 
@@ -22,13 +29,32 @@ class Heat2d:
         # Define dt according to Courant-Friedrichs-Lewy condition in 2 dimensions
         # (https://en.wikipedia.org/wiki/Courant%E2%80%93Friedrichs%E2%80%93Lewy_condition)  
         self.dt = min(self.dx**2/(2*self.alpha), self.dy**2/(2*self.alpha))  
-
-        # create MUI interface 
-        self.mui = MUI( self.nodes, self.dt)
+        cflDt = self.dt
+
+        # RKL2 super time stepping covers (stages^2+stages-2)/4 explicit steps with one step of 'stages' stages
+        self.stages = stages
+        if integrator == 'rkl2':
+            rklDt = superStepDt(self.dx, self.dy, self.alpha, stages)
+            self.dt = rklDt
+
+        # implicit integrators are unconditionally stable so dt can be chosen freely
+        if dt is not None:
+            self.dt = dt
+
+        # create MUI interface, transport='mpi' swaps the per step row exchange for plain MPI
+        # (see temperatureSolver.transport), only when every solver has the same number of nodes
+        # grid=(px, py) puts the solvers on a px x py grid, so they also couple to the solvers below and above
+        # fields are extra float fields to couple besides temp, their edge rows go with the temperature rows
+        # in the same commit every step (see pushEdgeRows)
+        # interfaceMemory bounds the neighbours' frames kept by the unifaces, ('frames', K) or ('window', length)
+        self.mui = MUI( self.nodes, self.dt, transport, grid, fields, interfaceMemory)
 
         # get solverNum and numSolvers from mui
         self.solverNum = self.mui.solverNum
         self.numSolvers = self.mui.numSolvers
+        # position along x (the chain the boundary condition sits at the start of) and y
+        self.xNum, self.numX = self.mui.xNum, self.mui.numX
+        self.yNum, self.numY = self.mui.yNum, self.mui.numY
         print("Solver: {:d}, Number of Solvers: {:d}".format(self.solverNum, self.numSolvers))
 
         print("Created heat solver {:d} with size {:f}m x {:f}m, {:d} nodes and diffusivity {:10f}".format(self.solverNum, self.height, self.width, self.nodes**2, self.alpha))
@@ -37,37 +63,60 @@ class Heat2d:
         # if doing multisolver create mui interface and sync dt and alpha with the other interfaces
         if self.numSolvers > 1:
             self.dt = self.mui.minDt
+
+        if integrator == 'explicit' and self.dt > cflDt:
+            raise ValueError("dt of {:f} is above the CFL limit {:f} of the explicit integrator.".format(self.dt, cflDt))
+        if integrator == 'rkl2' and self.dt > rklDt:
+            raise ValueError("dt of {:f} is above the stability limit {:f} of RKL2 with {:d} stages.".format(self.dt, rklDt, stages))
             
         prevAlpha, nextAlpha = self.mui.getAlphas(self.alpha)
 
         self.alphaAvgNext = (nextAlpha + self.alpha)/(2*self.alpha) 
         self.alphaAvgPrev = (prevAlpha + self.alpha)/(2*self.alpha)
 
+        belowAlpha, aboveAlpha = self.mui.getAlphasY(self.alpha)
+        self.alphaAvgBelow = (belowAlpha + self.alpha)/(2*self.alpha)
+        self.alphaAvgAbove = (aboveAlpha + self.alpha)/(2*self.alpha)
+
         if self.solverNum == 0:
             print("dt set at: {:f}".format(self.dt))
 
         # Temperature array
         self.T = np.zeros((self.nodes, self.nodes))
 
-        # Visualisation
-        fig, self.axis = plt.subplots()
-        self.pcm = self.axis.pcolormesh(self.T, cmap=plt.cm.jet, vmin=0, vmax = 100)
-        plt.colorbar(self.pcm, ax=self.axis)
+        # the extra coupled fields, set by the user like T, and the rows of them fetched from the
+        # previous (fieldGhostRows[field][0]) and next ([1]) solver
+        self.coupledFields = {field: np.zeros((self.nodes, self.nodes)) for field in fields}
+        self.fieldGhostRows = {field: np.zeros((2, self.nodes)) for field in fields}
 
-        # draw gridlines
-        #self.axis.grid(which='major', axis='both', linestyle='-', color='0.8', linewidth=0.5)
-        #self.axis.set_xticks(np.arange(0, self.nodes, 1))
-        #self.axis.set_yticks(np.arange(0, self.nodes, 1))
+        # progress of Heat2d.run
+        self.stepCount = 0
+        self.currentTime = 0.0
+        # with --restart the first call to run carries on from the newest checkpoint in that directory
+        self.restartDirectory = args.restart
+
+        # Visualisation, only created once something is drawn (see getVisualisation)
+        self.visualisation = None
+        self.colorMapScale = (0, 100)
 
         # setup for heat eq with numpy
         self.zerosX = np.zeros((1, self.nodes))
         self.zerosY = np.zeros((self.nodes, 1))
         self.zerosGhost = np.zeros((self.nodes, self.nodes-2))
+        # rows from the previous and next solver, the last solver keeps zeros in the second one
+        self.ghostRows = np.zeros((2, self.nodes))
 
         # set default BC
-        if self.solverNum == 0:
+        if self.xNum == 0:
             self.setBoundaryCondition('temp', 100)
 
+        # threads used by the 'threaded' and 'fused' backends on this rank, all cores by default
+        self.threads = threads
+        self.kernel = None
+        self.setBackend(backend)
+        self.linearSolver = linearSolver
+        self.setIntegrator(integrator)
+
 
     def initialiseTempField(self, val: float):
         self.T[:, :] = val
@@ -83,49 +132,240 @@ class Heat2d:
         else:
             raise ValueError('Boundary condition can have type \'temp\' or \'flux\', not ' + type + ".")
 
+    def setBackend(self, backend: str):
+        # 'numpy' is the reference implementation below, 'inplace' reuses preallocated ghost framed buffers,
+        # 'threaded' is 'inplace' with the rows shared out between self.threads threads
+        # and 'fused' does the whole update in one compiled multithreaded loop (needs numba)
+        # All of them update what doesn't need the neighbours' rows before fetching them (see calculateHeatEquationInPlace)
+        if backend == 'fused' and self.numY > 1:
+            raise ValueError('The \'fused\' backend has no solvers below and above, use \'numpy\', \'inplace\' or \'threaded\' on a grid.')
+        # the old kernel's threads are let go before it is replaced
+        if self.kernel is not None:
+            self.kernel.close()
+        if backend == 'numpy':
+            self.kernel = None
+            self.T = self.T.copy()
+        elif backend == 'inplace':
+            self.kernel = InPlaceKernel(self)
+            self.T = self.kernel.T
+        elif backend == 'threaded':
+            self.kernel = ThreadedKernel(self, threads=self.threads)
+            self.T = self.kernel.T
+        elif backend == 'fused':
+            self.kernel = FusedKernel(self, threads=self.threads)
+            self.T = self.kernel.T
+        else:
+            raise ValueError('Backend can be \'numpy\', \'inplace\', \'threaded\' or \'fused\', not ' + backend + ".")
+        self.backend = backend
+
+    def setIntegrator(self, integrator: str):
+        # 'explicit' uses the forward Euler update of the chosen backend,
+        # 'backwardEuler' and 'crankNicolson' solve a linear system every step, with self.linearSolver
+        # ('direct' factorises it once with scipy, 'multigrid' uses temperatureSolver.multigrid)
+        # and 'adi' does batched tridiagonal solves along x then y.
+        # 'adaptive' is backward Euler with error control, it changes self.dt every step
+        # 'rkl2' stays explicit but takes super steps of self.stages stencil applications
+        # On a grid of solvers only 'explicit' exchanges the columns with the solvers below and above
+        # The integrators other than 'explicit' fetch the neighbours' rows before their solve/stage, so the wait isn't overlapped
+        if integrator != 'explicit' and self.numY > 1:
+            raise ValueError('Only the \'explicit\' integrator can be used on a grid of solvers, not ' + integrator + ".")
+        if integrator == 'explicit':
+            self.implicit = None
+        elif integrator == 'rkl2':
+            self.implicit = None
+            self.superTimeStepping = RKLIntegrator(self, self.stages)
+        elif integrator == 'adi':
+            self.implicit = ADIIntegrator(self)
+        elif integrator == 'adaptive':
+            self.implicit = AdaptiveIntegrator(self, self.linearSolver)
+        else:
+            self.implicit = ImplicitIntegrator(self, integrator, self.linearSolver)
+        self.integrator = integrator
+
+    def setVisualisation(self, headless=False, frameDir='frames', asynchronous=False, frameRate=10, maxQueued=2):
+        # headless draws without a display and writes every frame/plot to frameDir as png,
+        # asynchronous (headless only) renders the frames on a background thread, see AsyncFrameWriter
+        if isinstance(self.visualisation, AsyncFrameWriter):
+            self.visualisation.close()
+        self.visualisation = Visualisation(self, headless, frameDir, *self.colorMapScale)
+        if asynchronous:
+            self.visualisation = AsyncFrameWriter(self.visualisation, frameRate, maxQueued)
+        return self.visualisation
+
+    def getVisualisation(self):
+        if self.visualisation is None:
+            self.setVisualisation()
+        return self.visualisation
+
     def setColorMapScale(self, min, max):
-        self.pcm.set_clim(min, max)
+        self.colorMapScale = (min, max)
+        if self.visualisation is not None:
+            self.visualisation.setColorMapScale(min, max)
        
         
     ## using numpy with shifts is roughly 150x faster for n=50
 
+    def getStepFunction(self):
+        # update for one step with the current integrator and backend
+        if self.integrator == 'adaptive':
+            return self.calculateHeatEquationAdaptive
+        elif self.integrator == 'rkl2':
+            return self.calculateHeatEquationSuperStep
+        elif self.implicit is not None:
+            return self.calculateHeatEquationImplicit
+        elif self.kernel is None:
+            return self.calculateHeatEquationNumpy
+        else:
+            return self.calculateHeatEquationInPlace
+
     def calculateHeatEquation(self, time, animate = False):
-        ## Idea: Do everything at once i.e xComponent =(dt/dx^2) Txplus1 + -2T + Txminus1
+        self.getStepFunction()(time)
+
+        if animate:
+            self.drawFrame(time)
+
+    def drawFrame(self, time):
+        self.getVisualisation().drawFrame(self.T, time)
+
+    def run(self, tEnd=None, stepsPerCall=None, callbackEvery=None, callbacks=(), animate=False):
+        # Advance the solution to tEnd (self.time by default), carrying on from where the last call stopped.
+        # Time is stepCount*dt from an integer step counter so it doesn't drift like i += dt
+        # (the adaptive integrator changes dt every step, there the time is accumulated).
+        # Steps are taken in a plain loop; callbacks(solver, step, time) are only called every
+        # callbackEvery steps and when tEnd is reached, animate adds drawing the colour map to them.
+        # At most stepsPerCall steps are taken per call, e.g. to hand control back to a GUI. The solver
+        # can keep stepping afterwards (run again with a later tEnd, solveSteadyState...), see close().
+        # Returns the number of steps taken.
+        if tEnd is None:
+            tEnd = self.time
+        if self.restartDirectory is not None:
+            self.restart(self.restartDirectory)
+            self.restartDirectory = None
+        callbacks = list(callbacks)
+        if animate:
+            callbacks.append(lambda solver, step, time: solver.drawFrame(time))
 
-        # push/fetch boundaries to/from adjacent solvers
-        rightPrev = None
-        if self.solverNum > 0:
-            ## push T[0, :] (left boundary)
-            self.mui.pushLeft(self.T[0, : ], time)
-            #fetch right boundary of previous solver
-            rightPrev = [self.mui.fetchRightPrev(time)]
-            rightPrev[0] *= self.alphaAvgPrev
+        adaptive = self.integrator == 'adaptive'
+        stepFunction = self.getStepFunction()
+        if adaptive:
+            totalSteps = None
         else:
-            if self.boundaryType == 'temp':
-                rightPrev = self.boundaryValue
+            totalSteps = int(np.ceil(tEnd/self.dt - 1e-9))
+
+        stepsTaken = 0
+        while not self.reached(tEnd, totalSteps) and (stepsPerCall is None or stepsTaken < stepsPerCall):
+            # steps until the next callback, the end of this call or the end of the run
+            chunk = sys.maxsize if adaptive else totalSteps - self.stepCount
+            if stepsPerCall is not None:
+                chunk = min(chunk, stepsPerCall - stepsTaken)
+            if callbackEvery:
+                chunk = min(chunk, callbackEvery - self.stepCount % callbackEvery)
+
+            if adaptive:
+                for step in range(chunk):
+                    stepFunction(self.currentTime, tEnd)
+                    self.currentTime += self.dt
+                    if self.reached(tEnd, None):
+                        chunk = step+1
+                        break
             else:
-                rightPrev = self.boundaryValue + self.T[0, :]
+                for step in range(self.stepCount, self.stepCount + chunk):
+                    stepFunction(step*self.dt)
+                self.currentTime = (self.stepCount + chunk)*self.dt
+            self.stepCount += chunk
+            stepsTaken += chunk
+
+            if (callbackEvery and self.stepCount % callbackEvery == 0) or self.reached(tEnd, totalSteps):
+                for callback in callbacks:
+                    callback(self, self.stepCount, self.currentTime)
+
+        return stepsTaken
+
+    def close(self):
+        # lets go of the 'threaded' backend's threads, once the solver isn't stepped any more.
+        # The solver can still be stepped after run returns and even after close (the pool is started again)
+        if self.kernel is not None:
+            self.kernel.close()
+
+    def getState(self):
+        # everything needed to carry on the run later, see temperatureSolver.checkpoint
+        state = {
+            'T': np.array(self.T),
+            'time': self.currentTime,
+            'step': self.stepCount,
+            'dt': self.dt,
+            'alphaAvgPrev': self.alphaAvgPrev,
+            'alphaAvgNext': self.alphaAvgNext,
+            'alphaAvgBelow': self.alphaAvgBelow,
+            'alphaAvgAbove': self.alphaAvgAbove,
+            'integrator': self.integrator,
+        }
+        if self.xNum == 0:
+            state['boundaryType'] = self.boundaryType
+            state['boundaryValue'] = np.array(self.boundaryValue)
+        if self.integrator == 'adaptive':
+            state['baseDt'] = self.implicit.baseDt
+            state['proposedDt'] = self.implicit.proposedDt
+        return state
+
+    def setState(self, state):
+        self.T[:, :] = state['T']
+        self.currentTime = float(state['time'])
+        self.stepCount = int(state['step'])
+        self.dt = float(state['dt'])
+        self.alphaAvgPrev = float(state['alphaAvgPrev'])
+        self.alphaAvgNext = float(state['alphaAvgNext'])
+        self.alphaAvgBelow = float(state['alphaAvgBelow'])
+        self.alphaAvgAbove = float(state['alphaAvgAbove'])
+        if 'boundaryType' in state:
+            self.boundaryType = str(state['boundaryType'])
+            self.boundaryValue = np.array(state['boundaryValue'])
+
+        # rebuilt so they use the restored dt and alpha factors
+        self.setBackend(self.backend)
+        self.setIntegrator(str(state['integrator']))
+        if 'proposedDt' in state:
+            self.implicit.baseDt = float(state['baseDt'])
+            self.implicit.proposedDt = float(state['proposedDt'])
+
+    def restart(self, directory):
+        # carry on from the newest checkpoint that every solver has
+        steps = checkpointSteps(directory, self.solverNum)
+        step = self.mui.minAcrossSolvers(steps[-1] if steps else -1)
+        # every solver has to have it, otherwise all of them stop here instead of the others waiting on the exchange
+        if not self.mui.minAcrossSolvers(step in steps):
+            raise FileNotFoundError("No checkpoint of step {:d} for every solver in {}.".format(step, directory))
+
+        # nothing is committed here: the unifaces of the new run are empty, so the first step's commit at
+        # the restart time is what the neighbours' first fetch waits for, with the rows in it
+        self.setState(loadCheckpoint(checkpointPath(directory, self.solverNum, step)))
+        if self.solverNum == 0:
+            print("Restarted from step {:d} at time {:f}".format(self.stepCount, self.currentTime))
 
-        leftNext = None
-        if self.solverNum != self.numSolvers-1:
-            self.mui.pushRight(self.T[-1, : ], time)
-            leftNext = [self.mui.fetchLeftNext(time)]
-            leftNext[0] *= self.alphaAvgNext
-        else:
-            leftNext = self.zerosX
+    def reached(self, tEnd, totalSteps):
+        if totalSteps is None:
+            # adaptive steps stop on or just past tEnd, allow for rounding in the accumulated time
+            return self.currentTime >= tEnd*(1 - 1e-12)
+        return self.stepCount >= totalSteps
+
+    def calculateHeatEquationNumpy(self, time):
+        ## Idea: Do everything at once i.e xComponent =(dt/dx^2) Txplus1 + -2T + Txminus1
+
+        # push boundaries to adjacent solvers, the rows they send back only enter the first and last row,
+        # so the update is done with zero ghost rows while they are on their way and they are added after
+        self.pushEdgeRows(time)
 
-        
         Txminus1 = None
         Txplus1 = None
         Tx = self.T.copy()
         
 
         # set up shifted versions of T (xComponent)
-        Txplus1 = np.concatenate((self.T[1:], leftNext))
-        Txminus1 = np.concatenate((rightPrev, self.T[:-1]))
+        Txplus1 = np.concatenate((self.T[1:], self.zerosX))
+        Txminus1 = np.concatenate((self.zerosX, self.T[:-1]))
 
         # for edge solvers one of these is redundant, could be made more efficient
-        if self.solverNum == 0:
+        if self.xNum == 0:
             Tx[-1, : ] *= self.alphaAvgNext
         else:
             Tx[0, : ] *= self.alphaAvgPrev
@@ -139,39 +379,151 @@ class Heat2d:
         Typlus1 = np.concatenate((self.T[:, 1:], self.zerosY), axis=1)
         Tyminus1 = np.concatenate((self.zerosY, self.T[:, :-1]), axis=1)
         ghostFlux = np.concatenate((self.T[:, :1], self.zerosGhost, self.T[:, -1:]), axis=1)
+        # on a grid the edge columns next to another solver are replaced by the exchanged ones
+        if self.numY > 1:
+            self.pushEdgeColumns(time)
+            self.fetchGhostColumns(time, ghostFlux[:, 0], ghostFlux[:, -1])
 
         yComponent = Typlus1 -2*self.T + Tyminus1 + ghostFlux
         yComponent *= self.dt/(self.dy**2)
-        self.T = self.T + self.alpha*(yComponent + xComponent)
-        
-        if animate:
-            self.pcm.set_array(self.T.T)
-            self.axis.set_title("Temperature at time t: {:.3f}s".format(time))
-            plt.pause(0.005)
-
-    def plotTemperature(self):
-
-        self.pcm.set_array(self.T.T)
-        self.axis.set_title("Temperature at time t: {:.3f}s".format(self.time))
-
-
-        fig, ax = plt.subplots()
-
-        xRange = np.linspace(self.solverNum*self.width, (self.solverNum+1)*self.width, self.nodes)
-        tempData = np.average(self.T, axis=1)
+        T = self.T + self.alpha*(yComponent + xComponent)
+
+        # fetch the rows of the previous and next solver (or the boundary condition) and finish the edge rows
+        self.fetchGhostRows(time, self.ghostRows[0], self.ghostRows[1])
+        self.ghostRows *= self.alpha*self.dt/(self.dx**2)
+        T[0, :] += self.ghostRows[0]
+        T[-1, :] += self.ghostRows[1]
+        self.T = T
+
+    def fillGhostRows(self, time, ghostPrev, ghostNext, implicitFlux=False):
+        # same boundaries as calculateHeatEquationNumpy but written straight into the given ghost rows
+        # with implicitFlux the T[0, :] part of a flux BC is left out, it is already in the implicit matrix
+        self.pushEdgeRows(time)
+        self.fetchGhostRows(time, ghostPrev, ghostNext, implicitFlux)
+
+    def pushEdgeRows(self, time):
+        # the first and last row of T and of every coupled field go to the previous and next solver,
+        # with one commit per neighbour. Both are pushed before anything is fetched, so neither
+        # neighbour waits on the other exchange
+        rows = {}
+        if self.xNum > 0:
+            rows['left'] = {'temp': self.T[0, :], **{field: values[0, :] for field, values in self.coupledFields.items()}}
+        if self.xNum != self.numX-1:
+            rows['right'] = {'temp': self.T[-1, :], **{field: values[-1, :] for field, values in self.coupledFields.items()}}
+        if rows:
+            self.mui.startExchange(rows, time)
+
+    def fetchGhostRows(self, time, ghostPrev, ghostNext, implicitFlux=False):
+        # both neighbours are fetched in one go, so a solver in the middle waits for them together
+        tags = ['temp', *self.coupledFields]
+        sides = {}
+        if self.xNum > 0:
+            sides['left'] = tags
+        if self.xNum != self.numX-1:
+            sides['right'] = tags
+        fetched = self.mui.finishExchange(sides, time) if sides else {}
+
+        if self.xNum > 0:
+            np.multiply(fetched['left']['temp'], self.alphaAvgPrev, out=ghostPrev)
+        elif self.boundaryType == 'temp' or implicitFlux:
+            np.copyto(ghostPrev, self.boundaryValue[0])
+        else:
+            np.add(self.boundaryValue[0], self.T[0, :], out=ghostPrev)
+
+        # last solver keeps the zero ghost row it was allocated with
+        if self.xNum != self.numX-1:
+            np.multiply(fetched['right']['temp'], self.alphaAvgNext, out=ghostNext)
+
+        for field, ghostRows in self.fieldGhostRows.items():
+            for row, side in enumerate(('left', 'right')):
+                if side in fetched:
+                    np.copyto(ghostRows[row], fetched[side][field])
+
+    def pushEdgeColumns(self, time):
+        # the first and last column go to the solvers below and above on a grid
+        if self.yNum > 0:
+            self.mui.pushBelow(self.T[:, 0], time)
+        if self.yNum != self.numY-1:
+            self.mui.pushAbove(self.T[:, -1], time)
+
+    def fetchGhostColumns(self, time, ghostBelow, ghostAbove):
+        # Ghost columns next to another solver hold T + alphaAvg*(neighbour - T) of the edge column, which gives
+        # the alpha averaged flux through that face with the plain 5 point stencil (for alphaAvg = 1 it is just
+        # the neighbour's column). The others are left alone, they are the zero flux copies of the edge column.
+        if self.yNum > 0:
+            np.subtract(self.mui.fetchTopBelow(time), self.T[:, 0], out=ghostBelow)
+            ghostBelow *= self.alphaAvgBelow
+            ghostBelow += self.T[:, 0]
+        if self.yNum != self.numY-1:
+            np.subtract(self.mui.fetchBottomAbove(time), self.T[:, -1], out=ghostAbove)
+            ghostAbove *= self.alphaAvgAbove
+            ghostAbove += self.T[:, -1]
+
+    def calculateHeatEquationInPlace(self, time):
+        # used by the 'inplace', 'threaded' and 'fused' backends
+        # the interior rows don't need the neighbours, so they are updated while the pushed rows are
+        # on their way and the fetches only hold up the first and last row
+        # (every row has an end in the ghost columns, so on a grid those are fetched before the interior)
+        self.pushEdgeRows(time)
+        if self.numY > 1:
+            self.pushEdgeColumns(time)
+            self.kernel.mirrorColumns()
+            self.fetchGhostColumns(time, self.kernel.ghostBelow, self.kernel.ghostAbove)
+        self.kernel.stepInterior()
+        self.fetchGhostRows(time, self.kernel.ghostPrev, self.kernel.ghostNext)
+        self.T = self.kernel.stepEdges()
+
+    def calculateHeatEquationImplicit(self, time):
+        self.fillGhostRows(time, self.implicit.ghostPrev, self.implicit.ghostNext, implicitFlux=True)
+        # written into T so the backend buffers stay valid
+        self.T[:, :] = self.implicit.step(self)
+
+    def calculateHeatEquationAdaptive(self, time, endTime=None):
+        # afterwards self.dt is the step actually taken, so loops can keep doing i += solver.dt
+        # steps are shortened so they don't go past endTime (self.time by default) by more than the smallest dt
+        if endTime is None:
+            endTime = self.time
+        self.fillGhostRows(time, self.implicit.ghostPrev, self.implicit.ghostNext, implicitFlux=True)
+        self.T[:, :] = self.implicit.step(self, time, endTime)
+
+    def calculateHeatEquationSuperStep(self, time):
+        # one RKL2 step of self.dt, the neighbour rows are exchanged before every stage
+        rkl = self.superTimeStepping
+        for stage in range(1, rkl.stages+1):
+            self.fillGhostRows(time + rkl.stageTimes[stage-1]*self.dt, rkl.ghostPrev, rkl.ghostNext, implicitFlux=True)
+            self.T[:, :] = rkl.stage(self, stage)
+
+    def solveSteadyState(self, tolerance=1e-6, maxIterations=10000):
+        # Solve for the equilibrium field directly instead of marching the time loop, with self.linearSolver.
+        # With several solvers the neighbour rows are not known in advance, so the direct solve is
+        # repeated with the latest interface rows until they change by less than tolerance on every solver.
+        steady = SteadyStateSolver(self, self.linearSolver)
+        ghostPrev = np.zeros(self.nodes)
+        ghostNext = np.zeros(self.nodes)
+
+        for iteration in range(maxIterations):
+            np.copyto(ghostPrev, steady.ghostPrev)
+            np.copyto(ghostNext, steady.ghostNext)
+
+            # the iteration number is used as MUI time
+            self.fillGhostRows(iteration, steady.ghostPrev, steady.ghostNext, implicitFlux=True)
+            self.T[:, :] = steady.solve(self)
+
+            if self.numSolvers == 1:
+                break
+            change = max(np.max(np.abs(steady.ghostPrev - ghostPrev)), np.max(np.abs(steady.ghostNext - ghostNext)))
+            if self.mui.maxAcrossSolvers(change) < tolerance:
+                break
 
-        slope, intercept = np.polyfit(xRange, tempData, 1)
+        if self.solverNum == 0:
+            print("Steady state reached after {:d} iterations".format(iteration+1))
+        return iteration+1
 
-        ax.plot(xRange, tempData)
-        ax.set_xlabel("x (m)")
-        ax.set_ylabel("Temp (K)")
-        ax.set_title("Temp from Solver {:d}. Equation of line: T = {:.3f}x + {:.2f}".format(self.solverNum, slope, intercept))
-        if(self.solverNum != self.numSolvers - 1):
-                print("T{:d} estimated as {:2f}".format(self.solverNum +2, np.average(self.T[-1])))
-        if self.solverNum == 0 :
+    def plotTemperature(self):
+        if(self.xNum != self.numX - 1):
+                print("T{:d} estimated as {:2f}".format(self.xNum +2, np.average(self.T[-1])))
+        if self.xNum == 0 :
             if self.boundaryType == 'flux':
-                print("T{:d} estimated as {:2f}".format(self.solverNum, np.average(self.T[0])))
-            
-        plt.show()
+                print("T{:d} estimated as {:2f}".format(self.xNum, np.average(self.T[0])))
 
-       
\ No newline at end of file
+        self.getVisualisation().plotTemperature(self.T, self.time)
@@ -0,0 +1,136 @@
+import numpy as np
+from temperatureSolver.stencil import diagonalX, diagonalY
+from temperatureSolver.multigrid import createMultigrid
+
+# scipy is optional, it is only needed for the direct linear solver
+try:
+    import scipy.sparse as sparse
+    from scipy.sparse.linalg import splu
+except ImportError:
+    sparse = None
+
+
+def buildOperator(solver):
+    # Sparse matrix A of the semi discrete system dT/dt = A T + b, using the same stencil as
+    # Heat2d.calculateHeatEquationNumpy. T is flattened row major (index i*nodes + j).
+    # b only holds the ghost rows (neighbour solvers or the temperature/flux BC), see ImplicitIntegrator.step.
+    nodes = solver.nodes
+    off = np.ones(nodes-1)
+    Dx = sparse.diags([off, diagonalX(solver), off], [-1, 0, 1])
+    Dy = sparse.diags([off, diagonalY(nodes), off], [-1, 0, 1])
+
+    identity = sparse.identity(nodes)
+    A = solver.alpha*(sparse.kron(Dx, identity)/solver.dx**2 + sparse.kron(identity, Dy)/solver.dy**2)
+    return A.tocsr()
+
+
+class ImplicitIntegrator:
+    # theta method on the 5 point operator: theta = 1 is backward Euler, theta = 0.5 is Crank-Nicolson
+    #   (I - theta*dt*A) T^{n+1} = (I + (1-theta)*dt*A) T^n + dt*b^n
+    # The ghost rows in b are lagged by one step so coupling through MUI is unchanged.
+    # With linearSolver='direct' the matrix is factorised once with scipy, with 'multigrid' every step
+    # is a few multigrid cycles started from the previous field. Either is only rebuilt if the boundary
+    # type or dt changes.
+
+    methods = {'backwardEuler': 1.0, 'crankNicolson': 0.5}
+    linearSolvers = ['direct', 'multigrid']
+
+    def __init__(self, solver, method, linearSolver='direct'):
+        if method not in self.methods:
+            raise ValueError('Implicit method can be \'backwardEuler\' or \'crankNicolson\', not ' + method + ".")
+        if linearSolver not in self.linearSolvers:
+            raise ValueError('Linear solver can be \'direct\' or \'multigrid\', not ' + linearSolver + ".")
+        if linearSolver == 'direct' and sparse is None:
+            raise ImportError("The direct linear solver requires scipy.")
+
+        self.method = method
+        self.theta = self.methods[method]
+        self.linearSolver = linearSolver
+        self.nodes = solver.nodes
+
+        # multigrid settings
+        self.cycle = 'V'
+        self.tolerance = 1e-8
+
+        # ghost rows filled by Heat2d before each step, the last solver keeps zeros for ghostNext
+        self.ghostPrev = np.zeros(self.nodes)
+        self.ghostNext = np.zeros(self.nodes)
+
+        self.boundaryType = None
+        self.dt = None
+
+    def factorise(self, solver):
+        if self.linearSolver == 'direct':
+            self.A = buildOperator(solver)
+            identity = sparse.identity(self.nodes**2, format='csr')
+            self.lu = splu((identity - self.theta*solver.dt*self.A).tocsc())
+        else:
+            # (I - theta*dt*A) = theta*dt*(shift - A) with shift = 1/(theta*dt)
+            self.multigrid = createMultigrid(solver, shift=1/(self.theta*solver.dt))
+        self.boundaryType = getattr(solver, 'boundaryType', None)
+        self.dt = solver.dt
+
+    def applyOperator(self, T):
+        # A T
+        if self.linearSolver == 'direct':
+            return (self.A @ T.ravel()).reshape(self.nodes, self.nodes)
+        return self.multigrid.levels[0].shift*T - self.multigrid.apply(T)
+
+    def step(self, solver):
+        # only the first solver has a boundary condition
+        if getattr(solver, 'boundaryType', None) != self.boundaryType or solver.dt != self.dt:
+            self.factorise(solver)
+
+        T = np.array(solver.T)
+        rhs = T.copy()
+        if self.theta < 1:
+            rhs += (1 - self.theta)*solver.dt*self.applyOperator(T)
+
+        # b is only non zero in the first and last rows
+        ghostScale = solver.dt*solver.alpha/solver.dx**2
+        rhs[0, :] += ghostScale*self.ghostPrev
+        rhs[-1, :] += ghostScale*self.ghostNext
+
+        if self.linearSolver == 'direct':
+            return self.lu.solve(rhs.ravel()).reshape(self.nodes, self.nodes)
+        rhs *= self.multigrid.levels[0].shift
+        T, residuals = self.multigrid.solve(rhs, u=T, kind=self.cycle, tolerance=self.tolerance)
+        return T
+
+
+class SteadyStateSolver:
+    # Solves the Laplace problem A T = -b directly, i.e. the state the explicit loop marches towards.
+    # Uses the same operator as ImplicitIntegrator so the BC and interface alpha rows are identical,
+    # either factorised once with scipy ('direct') or with multigrid cycles ('multigrid').
+
+    def __init__(self, solver, linearSolver='direct'):
+        if linearSolver not in ImplicitIntegrator.linearSolvers:
+            raise ValueError('Linear solver can be \'direct\' or \'multigrid\', not ' + linearSolver + ".")
+        if linearSolver == 'direct' and sparse is None:
+            raise ImportError("The direct linear solver requires scipy.")
+
+        self.linearSolver = linearSolver
+        self.nodes = solver.nodes
+        self.ghostPrev = np.zeros(self.nodes)
+        self.ghostNext = np.zeros(self.nodes)
+
+        # multigrid settings
+        self.cycle = 'F'
+        self.tolerance = 1e-10
+
+        if linearSolver == 'direct':
+            self.lu = splu(buildOperator(solver).tocsc())
+        else:
+            self.multigrid = createMultigrid(solver)
+
+    def solve(self, solver):
+        # -A T = b
+        rhs = np.zeros((self.nodes, self.nodes))
+        ghostScale = solver.alpha/solver.dx**2
+        rhs[0, :] += ghostScale*self.ghostPrev
+        rhs[-1, :] += ghostScale*self.ghostNext
+        if self.linearSolver == 'direct':
+            return -self.lu.solve(rhs.ravel()).reshape(self.nodes, self.nodes)
+        # previous field as first guess, it is close when iterating the interface rows
+        T, residuals = self.multigrid.solve(rhs, u=np.array(solver.T), kind=self.cycle, tolerance=self.tolerance)
+        return T
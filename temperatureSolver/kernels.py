@@ -0,0 +1,254 @@
+import numpy as np
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# numba is optional, it is only needed for the fused backend
+try:
+    from numba import njit, prange, set_num_threads
+except ImportError:
+    njit = None
+    prange = range
+
+
+class InPlaceKernel:
+    # Allocation free version of Heat2d.calculateHeatEquation.
+    # T lives in the interior of a (nodes+2, nodes+2) buffer whose outer frame holds the ghost cells:
+    #   row 0 / row -1     -> boundary from the previous / next solver (or the BC)
+    #   column 0 / col -1  -> copy of the first / last column (zero flux at top and bottom), on a grid of
+    #                         solvers Heat2d fills them from the solvers below and above before stepInterior
+    # Two buffers are kept and swapped every step so nothing is reallocated.
+    # A step is split in two so the neighbour exchange can overlap with the arithmetic: stepInterior updates
+    # every row that doesn't touch the ghost rows, stepEdges the first and last row once the ghost rows are in.
+
+    def __init__(self, solver):
+        self.nodes = solver.nodes
+
+        # coefficients of the x and y components, alpha included
+        self.cx = solver.alpha*solver.dt/(solver.dx**2)
+        self.cy = solver.alpha*solver.dt/(solver.dy**2)
+
+        # row whose x component is scaled by the interface alpha (see calculateHeatEquation)
+        if solver.xNum == 0:
+            self.interfaceRow = self.nodes-1
+            self.interfaceScale = solver.alphaAvgNext - 1
+        else:
+            self.interfaceRow = 0
+            self.interfaceScale = solver.alphaAvgPrev - 1
+
+        # scratch space for the x component and the interface row correction
+        self.xComponent = np.zeros((self.nodes, self.nodes))
+        self.interfaceCorrection = np.zeros(self.nodes)
+
+        # rows of T updated by stepInterior and stepEdges
+        self.rowParts = self.splitRows()
+
+        self.buffers = [np.zeros((self.nodes+2, self.nodes+2)), np.zeros((self.nodes+2, self.nodes+2))]
+        self.views = [self.createViews(buffer) for buffer in self.buffers]
+        self.current = 0
+        self.onGrid = solver.numY > 1
+
+        self.views[0]['T'][:, :] = solver.T
+
+    def splitRows(self):
+        return {'interior': (1, self.nodes-1), 'first': (0, 1), 'last': (self.nodes-1, self.nodes)}
+
+    def createViews(self, buffer):
+        # every slice used in a step is created once here, so a step only indexes a dict
+        return {
+            'T': buffer[1:-1, 1:-1],
+            'ghostPrev': buffer[0, 1:-1],
+            'ghostNext': buffer[-1, 1:-1],
+            'ghostLeft': buffer[1:-1, 0],
+            'ghostRight': buffer[1:-1, -1],
+            'firstCol': buffer[1:-1, 1],
+            'lastCol': buffer[1:-1, -2],
+            'rows': {part: self.createRowViews(buffer, *rows) for part, rows in self.rowParts.items()},
+        }
+
+    def createRowViews(self, buffer, start, end):
+        # slices for updating rows start to end-1 of T
+        views = {
+            'T': buffer[1+start:1+end, 1:-1],
+            'xPlus1': buffer[2+start:2+end, 1:-1],
+            'xMinus1': buffer[start:end, 1:-1],
+            'yPlus1': buffer[1+start:1+end, 2:],
+            'yMinus1': buffer[1+start:1+end, :-2],
+            'xComponent': self.xComponent[start:end],
+        }
+        if start <= self.interfaceRow < end:
+            views['interfaceRow'] = buffer[1+self.interfaceRow, 1:-1]
+            views['xInterfaceRow'] = self.xComponent[self.interfaceRow]
+        return views
+
+    @property
+    def T(self):
+        return self.views[self.current]['T']
+
+    @property
+    def ghostPrev(self):
+        return self.views[self.current]['ghostPrev']
+
+    @property
+    def ghostNext(self):
+        return self.views[self.current]['ghostNext']
+
+    @property
+    def ghostBelow(self):
+        return self.views[self.current]['ghostLeft']
+
+    @property
+    def ghostAbove(self):
+        return self.views[self.current]['ghostRight']
+
+    def step(self):
+        self.stepInterior()
+        return self.stepEdges()
+
+    def close(self):
+        # nothing is held besides the buffers
+        pass
+
+    def mirrorColumns(self):
+        # mirror first and last column into the ghost columns (zero flux)
+        src = self.views[self.current]
+        np.copyto(src['ghostLeft'], src['firstCol'])
+        np.copyto(src['ghostRight'], src['lastCol'])
+
+    def stepInterior(self):
+        if not self.onGrid:
+            self.mirrorColumns()
+        self.stepRows('interior')
+
+    def stepEdges(self):
+        # needs ghostPrev and ghostNext, returns the new T
+        self.stepRows('first')
+        self.stepRows('last')
+        self.current = 1 - self.current
+        return self.T
+
+    def stepRows(self, part):
+        src = self.views[self.current]['rows'][part]
+        dst = self.views[1 - self.current]['rows'][part]
+        T = src['T']
+        xComponent = src['xComponent']
+
+        # xComponent = Txplus1 - 2T + Txminus1, with the interface row scaled by alphaAvg
+        np.add(src['xPlus1'], src['xMinus1'], out=xComponent)
+        xComponent -= T
+        xComponent -= T
+        if 'interfaceRow' in src:
+            np.multiply(src['interfaceRow'], self.interfaceScale, out=self.interfaceCorrection)
+            src['xInterfaceRow'] -= self.interfaceCorrection
+        xComponent *= self.cx
+
+        # yComponent is built straight into the destination buffer
+        Tnew = dst['T']
+        np.add(src['yPlus1'], src['yMinus1'], out=Tnew)
+        Tnew -= T
+        Tnew -= T
+        Tnew *= self.cy
+        Tnew += xComponent
+        Tnew += T
+
+
+class ThreadedKernel(InPlaceKernel):
+    # InPlaceKernel with the interior rows split into one block per thread. numpy lets go of the GIL inside
+    # the array operations, so the blocks of a step are updated at the same time by a pool of threads that
+    # is kept for the whole run. Every block has its own slice of xComponent; the interface row is always
+    # the first or last row, so the shared interfaceCorrection is only used by stepEdges.
+    # close() shuts the pool down; it is started again if the kernel is stepped after that.
+
+    def __init__(self, solver, threads=None):
+        self.threads = threads or os.cpu_count()
+        super().__init__(solver)
+        self.pool = None
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+            self.pool = None
+
+    def splitRows(self):
+        rowParts = super().splitRows()
+        first, last = rowParts.pop('interior')
+        # blocks of nearly the same size, fewer than threads if there are not enough rows
+        bounds = np.unique(np.linspace(first, last, self.threads+1).astype(int))
+        self.blocks = ['block{:d}'.format(k) for k in range(len(bounds)-1)]
+        for block, start, end in zip(self.blocks, bounds[:-1], bounds[1:]):
+            rowParts[block] = (start, end)
+        return rowParts
+
+    def stepInterior(self):
+        if not self.onGrid:
+            self.mirrorColumns()
+        if self.pool is None:
+            self.pool = ThreadPoolExecutor(max_workers=self.threads)
+        # list() waits for every block and passes on any exception
+        list(self.pool.map(self.stepRows, self.blocks))
+
+
+def fusedStencil(src, dst, kx, ky, alpha, interfaceRow, interfaceAlpha, blockSize, firstRow, lastRow):
+    # Whole 5 point update of rows firstRow to lastRow-1 in one pass over memory. The ghost rows are part
+    # of xComponent here, while Heat2d.calculateHeatEquationNumpy adds them after the update, so the two
+    # agree to round-off (see temperatureSolver.parity).
+    # Blocks of rows are shared out between threads, each block is walked in column tiles.
+    nodes = src.shape[0] - 2
+    numBlocks = (lastRow - firstRow + blockSize - 1)//blockSize
+    for block in prange(numBlocks):
+        rowStart = firstRow + block*blockSize
+        rowEnd = min(rowStart + blockSize, lastRow)
+        for colStart in range(0, nodes, blockSize):
+            colEnd = min(colStart + blockSize, nodes)
+            for i in range(rowStart, rowEnd):
+                scale = interfaceAlpha if i == interfaceRow else 1.0
+                for j in range(max(colStart, 1), min(colEnd, nodes-1)):
+                    T = src[i+1, j+1]
+                    xComponent = src[i+2, j+1] - T*scale - T + src[i, j+1]
+                    yComponent = src[i+1, j+2] - 2*T + src[i+1, j]
+                    dst[i+1, j+1] = T + alpha*(yComponent*ky + xComponent*kx)
+
+                # zero flux at top and bottom: the missing neighbour is replaced by T itself
+                if colStart == 0:
+                    T = src[i+1, 1]
+                    xComponent = src[i+2, 1] - T*scale - T + src[i, 1]
+                    yComponent = src[i+1, 2] - 2*T + T
+                    dst[i+1, 1] = T + alpha*(yComponent*ky + xComponent*kx)
+                if colEnd == nodes:
+                    T = src[i+1, nodes]
+                    xComponent = src[i+2, nodes] - T*scale - T + src[i, nodes]
+                    yComponent = -2*T + src[i+1, nodes-1] + T
+                    dst[i+1, nodes] = T + alpha*(yComponent*ky + xComponent*kx)
+
+if njit is not None:
+    fusedStencil = njit(parallel=True, cache=True)(fusedStencil)
+
+
+class FusedKernel(InPlaceKernel):
+    # Same ghost framed double buffers as InPlaceKernel, but the step is a single compiled loop nest
+
+    def __init__(self, solver, blockSize=64, threads=None):
+        if njit is None:
+            raise ImportError("The 'fused' backend requires numba.")
+        # numba uses every core unless told otherwise
+        if threads is not None:
+            set_num_threads(threads)
+
+        super().__init__(solver)
+        self.blockSize = blockSize
+        self.alpha = solver.alpha
+        self.kx = solver.dt/(solver.dx**2)
+        self.ky = solver.dt/(solver.dy**2)
+
+        if solver.xNum == 0:
+            self.interfaceAlpha = solver.alphaAvgNext
+        else:
+            self.interfaceAlpha = solver.alphaAvgPrev
+
+    def stepInterior(self):
+        # the ghost columns aren't used, the compiled loop handles the zero flux edges itself
+        self.stepRows('interior')
+
+    def stepRows(self, part):
+        firstRow, lastRow = self.rowParts[part]
+        fusedStencil(self.buffers[self.current], self.buffers[1 - self.current], self.kx, self.ky,
+                     self.alpha, self.interfaceRow, self.interfaceAlpha, self.blockSize, firstRow, lastRow)
@@ -1,29 +1,96 @@
 import mui4py
 from mpi4py import MPI
 import numpy as np
+from temperatureSolver.transport import MUITransport, MPITransport
+
+
+# point arrays shared by every MUI object, uniface and tag, see interfacePoints
+pointCache = {}
+
+
+def interfacePoints(nodes, maxNodes, dims=1, dtype=np.float64):
+    # Point array for fetch_many and push_many: a row of nodes points spread evenly over 0..maxNodes along
+    # the first axis (normalised to the most nodes of any solver so rows of different resolution line up),
+    # the other coordinates are 0. dtype has to be the float type of the uniface config, fetch_many takes
+    # its data type from it. Built once per (nodes, maxNodes, dims) and read only, as it is shared.
+    key = (nodes, maxNodes, dims, np.dtype(dtype).str)
+    if key not in pointCache:
+        points = np.zeros((nodes, dims), dtype=dtype)
+        points[:, 0] = np.arange(nodes)*(maxNodes/nodes)
+        points.flags.writeable = False
+        pointCache[key] = points
+    return pointCache[key]
 
 
 class MUI:
 
-    def __init__(self, nodes, dt):
+    def __init__(self, nodes, dt, transport='mui', grid=None, fields=(), memory=('frames', 10)):
+        # transport moves the interface rows every step: 'mui' goes through the unifaces and samplers,
+        # 'mpi' is a direct exchange between neighbouring ranks for solvers with the same number of nodes
+        # grid=(px, py) lays the solvers out on a px x py Cartesian grid instead of a chain along x,
+        # so they also have neighbours below and above (only with the 'mpi' transport)
+        # fields are the names of float fields coupled besides temp, see exchange
+        # memory is how many of the neighbours' frames the unifaces keep, see MUITransport
+        if transport not in ('mui', 'mpi'):
+            raise ValueError('Transport can be \'mui\' or \'mpi\', not ' + transport + ".")
+
         self.nodes = nodes
         self.dt = dt
+        self.transport = None
+        self.fields = fields
 
         # Interface setup
         mui4py.mpi_split_by_app()
 
         self.MPI_COMM_WORLD = MPI.COMM_WORLD
 
-        dims = 1
-        config = mui4py.Config(dims, mui4py.FLOAT64)
+        self.dims = 1
+        config = mui4py.Config(self.dims, mui4py.FLOAT64)
         
         self.solverNum = self.MPI_COMM_WORLD.Get_rank()
         self.numSolvers = self.MPI_COMM_WORLD.Get_size()
 
+        # position of this solver along x and y, solverNum stays the rank
+        self.cart = None
+        if grid is None:
+            self.xNum, self.numX = self.solverNum, self.numSolvers
+            self.yNum, self.numY = 0, 1
+        else:
+            self.numX, self.numY = grid
+            if self.numX*self.numY != self.numSolvers:
+                raise ValueError("A grid of {:d} x {:d} solvers needs {:d} ranks, not {:d}.".format(self.numX, self.numY, self.numX*self.numY, self.numSolvers))
+            if transport != 'mpi':
+                raise ValueError("A grid of solvers needs the 'mpi' transport.")
+            # ranks are not reordered, so rank numbers are the same in cart and MPI_COMM_WORLD
+            self.cart = self.MPI_COMM_WORLD.Create_cart([self.numX, self.numY], periods=[False, False], reorder=False)
+            self.xNum, self.yNum = self.cart.Get_coords(self.solverNum)
 
         if self.numSolvers == 1:
             return None
 
+        # the unifaces only chain the solvers along x, on a grid everything goes over cart
+        if self.cart is None:
+            self.createUnifaces(config)
+
+        # Use MPI allreduce to find the solver with the smallest dt and the most nodes
+        self.minDt, self.maxNodes = self.findSuperlativeParameters()
+
+        #TODO: change spatial sampler so we can use different mesh resolution between solvers
+        self.s_sampler = mui4py.SamplerPseudoNearestNeighbor(0.5)
+        self.t_sampler = mui4py.TemporalSamplerExact()
+
+        ## Point array for fetching using fetch_many and push_many
+        self.points = interfacePoints(self.nodes, self.maxNodes, self.dims, config.float_type)
+
+        if transport == 'mpi':
+            if self.minAcrossSolvers(self.nodes) != self.maxNodes:
+                raise ValueError("The 'mpi' transport needs the same number of nodes on every solver, use 'mui' instead.")
+            comm = self.MPI_COMM_WORLD if self.cart is None else self.cart
+            self.transport = MPITransport(comm, self.getNeighbours(), self.nodes)
+        else:
+            self.transport = MUITransport(self, memory)
+
+    def createUnifaces(self, config):
         if self.solverNum == 0:
             iface =  ["ifs1"]
         elif self.solverNum == self.numSolvers-1:
@@ -34,35 +101,21 @@ class MUI:
         domain = "Solver" + str(self.solverNum)
         unifaces = mui4py.create_unifaces(domain, iface, config)
 
+        fieldTypes = {field: mui4py.FLOAT64 for field in self.fields}
+
         if self.solverNum != 0:
             self.leftUniface = unifaces["ifs" + str(self.solverNum)]
             self.leftUniface.set_data_types({"temp": mui4py.FLOAT64,
-                                     "alpha": mui4py.FLOAT64})
+                                     "alpha": mui4py.FLOAT64,
+                                     **fieldTypes})
 
         if self.solverNum != self.numSolvers-1:
             self.rightUniface = unifaces["ifs" + str(self.solverNum+1)]
 
             self.rightUniface.set_data_types({"temp": mui4py.FLOAT64,
                                      "alpha": mui4py.FLOAT64,
-                                     "nodes":mui4py.INT})
-
-        # Use MPI allreduce to find the solver with the smallest dt and the most nodes
-        self.minDt, self.maxNodes = self.findSuperlativeParameters()
-
-        #TODO: change spatial sampler so we can use different mesh resolution between solvers
-        self.s_sampler = mui4py.SamplerPseudoNearestNeighbor(0.5)
-        self.t_sampler = mui4py.TemporalSamplerExact()
-
-        ## Point array for fetching using fetch_many and push_many
-        # needs to be normalised to the maximum number nodes for any solver
-        i = 0
-        c = 0
-        step = self.maxNodes/self.nodes
-        self.points = np.zeros((self.nodes, 1))
-        while c < self.nodes:
-            self.points[c] = [i]
-            i += step
-            c += 1
+                                     "nodes":mui4py.INT,
+                                     **fieldTypes})
 
     def findSuperlativeParameters(self):
         minDt = self.MPI_COMM_WORLD.allreduce(self.dt, op=MPI.MIN)
@@ -70,7 +123,47 @@ class MUI:
         
         return (minDt, maxNodes)
 
+    def maxAcrossSolvers(self, value):
+        # e.g. to check convergence of all solvers at once
+        return self.MPI_COMM_WORLD.allreduce(value, op=MPI.MAX)
+
+    def minAcrossSolvers(self, value):
+        return self.MPI_COMM_WORLD.allreduce(value, op=MPI.MIN)
+
+    def retainedFrames(self):
+        # number of frames from each neighbour still held, e.g. to keep an eye on memory use
+        if self.transport is None:
+            return {}
+        return self.transport.retainedFrames()
+
+    def getNeighbours(self):
+        # rank of the solver on every side that has one
+        if self.cart is None:
+            ranks = {'left': self.solverNum-1 if self.solverNum > 0 else MPI.PROC_NULL,
+                     'right': self.solverNum+1 if self.solverNum != self.numSolvers-1 else MPI.PROC_NULL}
+        else:
+            ranks = {}
+            ranks['left'], ranks['right'] = self.cart.Shift(0, 1)
+            ranks['below'], ranks['above'] = self.cart.Shift(1, 1)
+        return {side: rank for side, rank in ranks.items() if rank != MPI.PROC_NULL}
+
+    def exchangeWithNeighbours(self, value, direction):
+        # value of the previous and next solver along direction (0 is x, 1 is y) of the grid,
+        # a solver on the edge of the grid gets its own value for the missing side
+        prev, next = self.cart.Shift(direction, 1)
+        fromPrev = self.cart.sendrecv(value, dest=next, source=prev)
+        fromNext = self.cart.sendrecv(value, dest=prev, source=next)
+        return (value if fromPrev is None else fromPrev, value if fromNext is None else fromNext)
+
+    def getAlphasY(self, alpha):
+        # alpha of the solvers below and above, only a grid has them
+        if self.cart is None:
+            return (alpha, alpha)
+        return self.exchangeWithNeighbours(alpha, 1)
+
     def getAlphas(self, alpha):
+        if self.cart is not None:
+            return self.exchangeWithNeighbours(alpha, 0)
         rightAlpha = None
         leftAlpha = None
         if self.solverNum != 0:
@@ -89,30 +182,42 @@ class MUI:
             
         return (leftAlpha, rightAlpha)
 
-    
+
+    def startExchange(self, fields, time):
+        # fields maps a side ('left', 'right', and 'below', 'above' on a grid) to {tag: values} for that
+        # neighbour. Every tag is pushed and each neighbour gets a single commit.
+        self.transport.start(fields, time)
+
+    def finishExchange(self, tags, time):
+        # tags maps a side to the tags fetched from that neighbour, returns {side: {tag: values}}
+        return self.transport.finish(tags, time)
+
+    def exchange(self, fields, time):
+        # all fields in one go, so the coupling cost per step doesn't grow with the number of fields.
+        # Work that doesn't need the neighbours can go between startExchange and finishExchange instead.
+        self.startExchange(fields, time)
+        return self.finishExchange({side: list(values) for side, values in fields.items()}, time)
+
     def pushRight(self, vals, time, data="temp"):
-        self.rightUniface.push_many(data, self.points, vals)
-        self.rightUniface.commit( time )
+        self.transport.pushRight(vals, time, data)
 
     def pushLeft(self, vals, time, data="temp"):
-        self.leftUniface.push_many(data, self.points, vals)
-        self.leftUniface.commit( time )
-            
+        self.transport.pushLeft(vals, time, data)
 
     def fetchRightPrev(self, time, data="temp"):
-        vals = self.leftUniface.fetch_many(data, self.points, time, 
-                                       self.s_sampler, self.t_sampler)
-        
-        # forget to save memory
-        self.leftUniface.forget( time-self.dt)
-        #print( vals )
-        return vals
-    
+        return self.transport.fetchRightPrev(time, data)
+
     def fetchLeftNext(self, time, data="temp"):
-        vals = self.rightUniface.fetch_many(data, self.points, time, 
-                                       self.s_sampler, self.t_sampler)
-        
-        # forget to save memory
-        self.rightUniface.forget( time-self.dt)
-        #print( vals )
-        return vals
+        return self.transport.fetchLeftNext(time, data)
+
+    def pushBelow(self, vals, time, data="temp"):
+        self.transport.pushBelow(vals, time, data)
+
+    def pushAbove(self, vals, time, data="temp"):
+        self.transport.pushAbove(vals, time, data)
+
+    def fetchTopBelow(self, time, data="temp"):
+        return self.transport.fetchTopBelow(time, data)
+
+    def fetchBottomAbove(self, time, data="temp"):
+        return self.transport.fetchBottomAbove(time, data)
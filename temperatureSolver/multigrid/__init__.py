@@ -0,0 +1,2 @@
+from temperatureSolver.multigrid.multigrid import Multigrid, createMultigrid
+from temperatureSolver.multigrid.level import Level
@@ -0,0 +1,108 @@
+import numpy as np
+
+
+class Level:
+    # One grid of the multigrid hierarchy. Solves L u = f with
+    #   L u = shift*u - A u
+    #   A u = alpha/hx^2 (u[i-1] + u[i+1] + diagX[i] u[i]) + alpha/hy^2 (u[j-1] + u[j+1] + diagY[j] u[j])
+    # which is the Heat2d operator (see implicit.buildOperator) with the ghost rows moved into f.
+    # shift = 0 gives the steady state problem, shift = 1/(theta*dt) an implicit time step.
+    # Arrays use the Heat2d.T layout: axis 0 is x (solver chain direction), axis 1 is y.
+    #
+    # The first and last diagonal entries are -(1 + weight/ratio): weight is the boundary face coefficient
+    # (1 for a temperature BC, alphaAvg for an interface to another solver, 0 for flux/zero flux) and
+    # ratio is the distance to the ghost value over h. On the finest grid ratio is 1.
+
+    def __init__(self, nx, ny, hx, hy, alpha, diagX, diagY, shift, ratioX=(1.0, 1.0), ratioY=(1.0, 1.0)):
+        self.nx = nx
+        self.ny = ny
+        self.hx = hx
+        self.hy = hy
+        self.ax = alpha/hx**2
+        self.ay = alpha/hy**2
+        self.alpha = alpha
+        self.diagX = diagX
+        self.diagY = diagY
+        self.ratioX = ratioX
+        self.ratioY = ratioY
+        self.shift = shift
+
+        # diagonal of L, used by the smoother
+        self.diag = shift - self.ax*diagX[:, None] - self.ay*diagY[None, :]
+
+        # red black colouring for Gauss-Seidel
+        i, j = np.indices((nx, ny))
+        self.red = (i + j) % 2 == 0
+        self.black = ~self.red
+
+        self.matrix = None
+
+    def neighbourSum(self, u):
+        # off diagonal part of A applied to u (ghost values are zero, they live in f)
+        s = np.zeros_like(u)
+        s[1:] += u[:-1]
+        s[:-1] += u[1:]
+        s *= self.ax
+        sy = np.zeros_like(u)
+        sy[:, 1:] += u[:, :-1]
+        sy[:, :-1] += u[:, 1:]
+        s += self.ay*sy
+        return s
+
+    def apply(self, u):
+        # L u
+        return self.diag*u - self.neighbourSum(u)
+
+    def residual(self, u, f):
+        return f - self.apply(u)
+
+    def smooth(self, u, f, sweeps):
+        # red black Gauss-Seidel, each colour only depends on the other one so it is updated at once
+        for sweep in range(sweeps):
+            for colour in (self.red, self.black):
+                update = (f + self.neighbourSum(u))/self.diag
+                np.copyto(u, update, where=colour)
+        return u
+
+    def fixedBoundaries(self):
+        # which ends have a fixed ghost value (the coarse grid correction is zero there)
+        # as (x first, x last, y first, y last)
+        return (self.diagX[0] < -1, self.diagX[-1] < -1, self.diagY[0] < -1, self.diagY[-1] < -1)
+
+    def coarsen(self, coarsenX, coarsenY):
+        # rediscretised operator on a grid with half the nodes in the chosen directions
+        nx, hx, diagX, ratioX = self.nx, self.hx, self.diagX, self.ratioX
+        ny, hy, diagY, ratioY = self.ny, self.hy, self.diagY, self.ratioY
+        if coarsenX:
+            nx, hx = (self.nx + 1)//2, 2*self.hx
+            diagX, ratioX = coarsenDiagonal(self.diagX, self.ratioX)
+        if coarsenY:
+            ny, hy = (self.ny + 1)//2, 2*self.hy
+            diagY, ratioY = coarsenDiagonal(self.diagY, self.ratioY)
+        return Level(nx, ny, hx, hy, self.alpha, diagX, diagY, self.shift, ratioX, ratioY)
+
+    def solveDirect(self, f):
+        # coarsest level only, small enough for a dense solve
+        if self.matrix is None:
+            Dx = np.diag(self.diagX) + np.eye(self.nx, k=1) + np.eye(self.nx, k=-1)
+            Dy = np.diag(self.diagY) + np.eye(self.ny, k=1) + np.eye(self.ny, k=-1)
+            A = self.ax*np.kron(Dx, np.eye(self.ny)) + self.ay*np.kron(np.eye(self.nx), Dy)
+            self.matrix = self.shift*np.eye(self.nx*self.ny) - A
+        return np.linalg.solve(self.matrix, f.ravel()).reshape(self.nx, self.ny)
+
+
+def coarsenDiagonal(diag, ratio):
+    # Interior rows stay -2. A coarse cell centre sits half a fine cell further from the boundary
+    # than its first child, so the distance to the ghost value (relative to h) changes and the
+    # boundary face weight is rescaled accordingly. With an odd number of cells the last coarse
+    # cell has a single child and keeps its centre.
+    n = len(diag)
+    firstWeight = -(diag[0] + 1)*ratio[0]
+    lastWeight = -(diag[-1] + 1)*ratio[1]
+    firstRatio = ratio[0]/2 + 0.25
+    lastRatio = ratio[1]/2 + 0.25 if n % 2 == 0 else ratio[1]/2
+
+    coarse = np.full((n + 1)//2, -2.0)
+    coarse[0] = -(1 + firstWeight/firstRatio)
+    coarse[-1] = -(1 + lastWeight/lastRatio)
+    return coarse, (firstRatio, lastRatio)
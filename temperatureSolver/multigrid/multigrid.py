@@ -0,0 +1,82 @@
+import numpy as np
+from temperatureSolver.stencil import diagonalX, diagonalY
+from temperatureSolver.multigrid.level import Level
+from temperatureSolver.multigrid.transfer import restrict, prolong
+
+
+class Multigrid:
+    # Geometric multigrid for L u = f on the Heat2d grid (see Level for the operator).
+    # The Heat2d grid is usually strongly anisotropic (dx = length/nodes, dy = height/nodes), which point
+    # smoothers handle badly, so each level is only coarsened in the direction(s) with strong coupling
+    # (semi coarsening) until the coupling is balanced.
+
+    def __init__(self, level, preSmooth=2, postSmooth=2, maxCoarseSize=64):
+        self.preSmooth = preSmooth
+        self.postSmooth = postSmooth
+
+        self.levels = [level]
+        self.coarsening = []
+        while level.nx*level.ny > maxCoarseSize and max(level.nx, level.ny) > 2:
+            coarsenX = level.nx > 2 and level.ax >= 0.5*level.ay
+            coarsenY = level.ny > 2 and level.ay >= 0.5*level.ax
+            if not (coarsenX or coarsenY):
+                coarsenX = level.nx > 2
+                coarsenY = level.ny > 2
+            self.coarsening.append((coarsenX, coarsenY))
+            level = level.coarsen(coarsenX, coarsenY)
+            self.levels.append(level)
+
+    def cycle(self, u, f, kind='V', l=0):
+        # one V, W or F cycle starting on level l, u is updated in place
+        level = self.levels[l]
+        if l == len(self.levels) - 1:
+            u[:, :] = level.solveDirect(f)
+            return u
+
+        level.smooth(u, f, self.preSmooth)
+
+        coarsenX, coarsenY = self.coarsening[l]
+        coarseF = restrict(level.residual(u, f), coarsenX, coarsenY)
+        coarseU = np.zeros_like(coarseF)
+        if kind == 'V':
+            self.cycle(coarseU, coarseF, 'V', l+1)
+        elif kind == 'W':
+            self.cycle(coarseU, coarseF, 'W', l+1)
+            self.cycle(coarseU, coarseF, 'W', l+1)
+        elif kind == 'F':
+            self.cycle(coarseU, coarseF, 'F', l+1)
+            self.cycle(coarseU, coarseF, 'V', l+1)
+        else:
+            raise ValueError('Multigrid cycle can be \'V\', \'W\' or \'F\', not ' + kind + ".")
+        u += prolong(coarseU, level, coarsenX, coarsenY)
+
+        level.smooth(u, f, self.postSmooth)
+        return u
+
+    def solve(self, f, u=None, kind='V', tolerance=1e-10, maxCycles=100):
+        # cycles until the residual norm drops below tolerance relative to f
+        # returns the solution and the residual norm after every cycle
+        if u is None:
+            u = np.zeros_like(f)
+        fNorm = np.linalg.norm(f)
+        if fNorm == 0:
+            fNorm = 1.0
+
+        residuals = []
+        for cycle in range(maxCycles):
+            self.cycle(u, f, kind)
+            residuals.append(np.linalg.norm(self.levels[0].residual(u, f))/fNorm)
+            if residuals[-1] < tolerance:
+                break
+        return u, residuals
+
+    def apply(self, u):
+        # L u on the finest level
+        return self.levels[0].apply(u)
+
+
+def createMultigrid(solver, shift=0.0, **kwargs):
+    # multigrid hierarchy for the operator of a Heat2d solver, including its interface alpha rows and BC
+    level = Level(solver.nodes, solver.nodes, solver.dx, solver.dy, solver.alpha,
+                  diagonalX(solver), diagonalY(solver.nodes), shift)
+    return Multigrid(level, **kwargs)
@@ -0,0 +1,45 @@
+import numpy as np
+
+
+# Cell centred grid transfers, applied one axis at a time so a level can be coarsened in x, y or both.
+# An odd number of cells leaves the last coarse cell with a single child.
+
+def restrictAxis(r, axis):
+    # average of each pair of children
+    n = r.shape[axis]
+    starts = np.arange(0, n, 2)
+    counts = np.minimum(2, n - starts)
+    coarse = np.add.reduceat(r, starts, axis=axis)
+    shape = [1]*r.ndim
+    shape[axis] = len(counts)
+    return coarse/counts.reshape(shape)
+
+
+def prolongAxis(e, n, axis, firstFixed, lastFixed):
+    # linear interpolation, each child takes 3/4 of its parent and 1/4 of the nearest other coarse cell.
+    # Past the boundary the correction is zero for a fixed ghost value and equal to the edge cell otherwise.
+    e = np.moveaxis(e, axis, 0)
+    lower = np.concatenate((np.zeros_like(e[:1]) if firstFixed else e[:1], e[:-1]))
+    upper = np.concatenate((e[1:], np.zeros_like(e[-1:]) if lastFixed else e[-1:]))
+    fine = np.empty((2*e.shape[0],) + e.shape[1:])
+    fine[0::2] = 0.75*e + 0.25*lower
+    fine[1::2] = 0.75*e + 0.25*upper
+    return np.moveaxis(fine[:n], 0, axis)
+
+
+def restrict(r, coarsenX, coarsenY):
+    if coarsenX:
+        r = restrictAxis(r, 0)
+    if coarsenY:
+        r = restrictAxis(r, 1)
+    return r
+
+
+def prolong(e, level, coarsenX, coarsenY):
+    # level is the fine level the correction is interpolated to
+    firstX, lastX, firstY, lastY = level.fixedBoundaries()
+    if coarsenX:
+        e = prolongAxis(e, level.nx, 0, firstX, lastX)
+    if coarsenY:
+        e = prolongAxis(e, level.ny, 1, firstY, lastY)
+    return e
@@ -0,0 +1,43 @@
+from temperatureSolver.heat2d import Heat2d
+import numpy as np
+import sys
+
+
+# Backend parity check: every backend is run from the same initial field and
+# compared against the numpy reference. Also works for a chain of solvers, e.g.
+# mpirun -np 1 python3 -m temperatureSolver.parity.main : -np 1 python3 -m temperatureSolver.parity.main --alpha 2.5e-4
+
+solver = Heat2d(time=1.0, nodes=50)
+steps = 200
+tolerance = 1e-10
+
+# random field so the interface rows and ghost columns are actually exercised
+initialT = np.random.default_rng(solver.solverNum).random((solver.nodes, solver.nodes))*100
+
+
+def runBackend(backend, startTime):
+    solver.setBackend(backend)
+    solver.T[:, :] = initialT
+    i = startTime
+    for step in range(steps):
+        solver.calculateHeatEquation(i)
+        i += solver.dt
+    return solver.T.copy(), i
+
+
+reference, i = runBackend('numpy', 0)
+
+failed = False
+for backend in ['inplace', 'threaded', 'fused']:
+    try:
+        result, i = runBackend(backend, i)
+    except ImportError as e:
+        print("Solver {:d}: skipping backend {}: {}".format(solver.solverNum, backend, e))
+        continue
+
+    error = np.max(np.abs(result - reference))
+    print("Solver {:d}: backend {} max difference from numpy {:.3e}".format(solver.solverNum, backend, error))
+    if error > tolerance:
+        failed = True
+
+sys.exit(1 if failed else 0)
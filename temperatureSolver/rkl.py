@@ -0,0 +1,114 @@
+import numpy as np
+from temperatureSolver.stencil import diagonalX, diagonalY
+from temperatureSolver.adi import applySecondDifference
+
+
+def superStepDt(dx, dy, alpha, stages):
+    # largest stable step of RKL2 with the given number of stages:
+    # (s^2+s-2)/4 times the forward Euler limit of the 2D 5 point stencil
+    if stages < 2:
+        raise ValueError("RKL2 needs at least 2 stages, not {:d}.".format(stages))
+    forwardEulerDt = 1/(2*alpha*(1/dx**2 + 1/dy**2))
+    return forwardEulerDt*(stages**2 + stages - 2)/4
+
+
+class RKLIntegrator:
+    # Second order Runge-Kutta-Legendre super time stepping (RKL2, Meyer, Balsara & Aslam 2014).
+    # A step of size dt is built from s forward Euler like stages whose coefficients come from the
+    # Legendre polynomial recursion, so it stays stable for dt up to (s^2+s-2)/4 times the explicit limit
+    # while only ever applying the stencil. With
+    #   L(Y) = A Y + b   (the explicit stencil, b holds the ghost rows)
+    #   Y_0 = T^n,  Y_1 = Y_0 + muTilde_1 dt L(Y_0)
+    #   Y_j = mu_j Y_{j-1} + nu_j Y_{j-2} + (1-mu_j-nu_j) Y_0 + muTilde_j dt L(Y_{j-1}) + gammaTilde_j dt L(Y_0)
+    #   T^{n+1} = Y_s
+    # L(Y_{j-1}) needs the neighbour rows at stage j-1, so Heat2d pushes/fetches once per stage at
+    # time + stageTimes[j-1]*dt.
+
+    def __init__(self, solver, stages):
+        self.maxDt = superStepDt(solver.dx, solver.dy, solver.alpha, stages)
+        self.stages = stages
+        self.nodes = solver.nodes
+
+        # recursion coefficients, index j is stage j (index 0 is unused)
+        w1 = 4/(stages**2 + stages - 2)
+        b = [1/3, 1/3, 1/3] + [(j**2 + j - 2)/(2*j*(j + 1)) for j in range(3, stages+1)]
+        self.mu = np.zeros(stages+1)
+        self.nu = np.zeros(stages+1)
+        self.muTilde = np.zeros(stages+1)
+        self.gammaTilde = np.zeros(stages+1)
+        self.muTilde[1] = b[1]*w1
+        for j in range(2, stages+1):
+            self.mu[j] = (2*j - 1)/j*b[j]/b[j-1]
+            self.nu[j] = -(j - 1)/j*b[j]/b[j-2]
+            self.muTilde[j] = self.mu[j]*w1
+            self.gammaTilde[j] = -(1 - b[j-1])*self.muTilde[j]
+
+        # fraction of dt at which stage j evaluates the operator (at Y_{j-1}), all distinct and below 1
+        self.stageTimes = [0.0, self.muTilde[1]] + [(j**2 + j - 2)*w1/4 for j in range(2, stages)]
+
+        # ghost rows filled by Heat2d before each stage, the last solver keeps zeros for ghostNext
+        self.ghostPrev = np.zeros(self.nodes)
+        self.ghostNext = np.zeros(self.nodes)
+
+        self.Y0 = np.zeros((self.nodes, self.nodes))
+        self.LY0 = np.zeros((self.nodes, self.nodes))
+        self.Yprev = np.zeros((self.nodes, self.nodes))
+        self.Ynew = np.zeros((self.nodes, self.nodes))
+        self.work = np.zeros((self.nodes, self.nodes))
+        self.scratch = np.zeros((self.nodes, self.nodes))
+
+        self.diagX = None
+        self.boundaryType = None
+
+    def setup(self, solver):
+        self.ax = solver.alpha/solver.dx**2
+        self.ay = solver.alpha/solver.dy**2
+        self.diagX = diagonalX(solver)
+        self.diagY = diagonalY(self.nodes)
+        self.boundaryType = getattr(solver, 'boundaryType', None)
+
+    def applyOperator(self, T, out, scale):
+        # out = scale*L(T), the same stencil as Heat2d.calculateHeatEquationNumpy
+        # y part along the rows of T, so every pass is contiguous
+        work = self.work
+        np.multiply(T, self.diagY, out=work)
+        work[:, 1:] += T[:, :-1]
+        work[:, :-1] += T[:, 1:]
+        work *= scale*self.ay
+
+        applySecondDifference(self.diagX, T, out)
+        out[0] += self.ghostPrev
+        out[-1] += self.ghostNext
+        out *= scale*self.ax
+        out += work
+        return out
+
+    def stage(self, solver, j):
+        # solver.T holds Y_{j-1} and the ghost rows are those of stage j-1, returns Y_j
+        dt = solver.dt
+        Ynew = self.Ynew
+        if j == 1:
+            # only the first solver has a boundary condition
+            if self.diagX is None or getattr(solver, 'boundaryType', None) != self.boundaryType:
+                self.setup(solver)
+            np.copyto(self.Y0, solver.T)
+            np.copyto(self.Yprev, solver.T)
+            # dt L(Y_0) is kept for the later stages
+            self.applyOperator(self.Y0, self.LY0, dt)
+            np.multiply(self.LY0, self.muTilde[1], out=Ynew)
+            Ynew += self.Y0
+            return Ynew
+
+        # Y_j = mu_j Y_{j-1} + muTilde_j dt L(Y_{j-1}) + the Y_{j-2}, Y_0 and L(Y_0) terms
+        self.applyOperator(solver.T, Ynew, self.muTilde[j]*dt)
+        scratch = self.scratch
+        np.multiply(solver.T, self.mu[j], out=scratch)
+        Ynew += scratch
+        np.multiply(self.Yprev, self.nu[j], out=scratch)
+        Ynew += scratch
+        np.multiply(self.Y0, 1 - self.mu[j] - self.nu[j], out=scratch)
+        Ynew += scratch
+        np.multiply(self.LY0, self.gammaTilde[j], out=scratch)
+        Ynew += scratch
+        np.copyto(self.Yprev, solver.T)
+        return Ynew
@@ -0,0 +1,126 @@
+import numpy as np
+import json
+import os
+
+
+# Time series of Heat2d.T on disk, three files per solver (rank) in a directory:
+#   solver<N>.dat        raw float64 fields of shape (nodes, nodes), one after the other
+#   solver<N>_index.npy  time and step of every field, step -1 for the space not written yet
+#   solver<N>.json       header with the grid/material parameters, written at the start and by close()
+# The data and index files are memory mapped, so writing a snapshot is one contiguous copy of T plus
+# one index entry, and reading a time range only touches the fields in that range.
+
+indexType = np.dtype([('time', '<f8'), ('step', '<i8')])
+
+
+class SnapshotWriter:
+    # Use as a Heat2d.run callback, e.g. solver.run(callbackEvery=100, callbacks=[SnapshotWriter(solver)])
+    # The files are preallocated for `capacity` fields (by default enough for solver.time at the current dt)
+    # and doubled when they fill up.
+
+    def __init__(self, solver, directory='snapshots', capacity=None, callbackEvery=1):
+        self.nodes = solver.nodes
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.dataPath = os.path.join(directory, "solver{:d}.dat".format(solver.solverNum))
+        self.indexPath = os.path.join(directory, "solver{:d}_index.npy".format(solver.solverNum))
+        self.headerPath = os.path.join(directory, "solver{:d}.json".format(solver.solverNum))
+
+        if capacity is None:
+            capacity = int(np.ceil(solver.time/solver.dt))//callbackEvery + 2
+        self.capacity = max(capacity, 1)
+        self.count = 0
+
+        # count is only filled in by close(), until then readers go by the index
+        self.header = {
+            "solverNum": solver.solverNum,
+            "numSolvers": solver.numSolvers,
+            "nodes": solver.nodes,
+            "dx": solver.dx,
+            "dy": solver.dy,
+            "alpha": solver.alpha,
+            "dtype": "<f8",
+            "count": None,
+        }
+        self.writeHeader()
+
+        self.data = np.memmap(self.dataPath, dtype='<f8', mode='w+', shape=(self.capacity, self.nodes, self.nodes))
+        self.index = self.createIndex(self.indexPath, self.capacity)
+
+    def createIndex(self, path, capacity):
+        index = np.lib.format.open_memmap(path, mode='w+', dtype=indexType, shape=(capacity,))
+        index['step'] = -1
+        return index
+
+    def __call__(self, solver, step, time):
+        self.write(solver.T, step, time)
+
+    def write(self, T, step, time):
+        if self.count == self.capacity:
+            self.resize(2*self.capacity)
+        np.copyto(self.data[self.count], T)
+        # the step goes in last, a reader only counts the field once it is set
+        self.index['time'][self.count] = time
+        self.index['step'][self.count] = step
+        self.count += 1
+
+    def resize(self, capacity):
+        # grow (or shrink) the files and map them again, the fields already written stay in place
+        self.data.flush()
+        del self.data
+        with open(self.dataPath, 'r+b') as f:
+            f.truncate(capacity*self.nodes*self.nodes*8)
+        self.data = np.memmap(self.dataPath, dtype='<f8', mode='r+', shape=(capacity, self.nodes, self.nodes))
+
+        # the shape is in the .npy header, so the index is copied to a new file and renamed
+        index = self.createIndex(self.indexPath + ".tmp", capacity)
+        kept = min(self.count, capacity)
+        index[:kept] = self.index[:kept]
+        index.flush()
+        del self.index
+        os.replace(self.indexPath + ".tmp", self.indexPath)
+        self.index = index
+        self.capacity = capacity
+
+    def writeHeader(self):
+        # written next to the old one and renamed, so a reader never sees half a header
+        with open(self.headerPath + ".tmp", 'w') as f:
+            json.dump(self.header, f)
+        os.replace(self.headerPath + ".tmp", self.headerPath)
+
+    def close(self):
+        # drop the unused preallocated space
+        self.resize(max(self.count, 1))
+        self.data.flush()
+        self.index.flush()
+        self.header["count"] = self.count
+        self.writeHeader()
+
+
+class SnapshotReader:
+    # Read only view of the fields written by SnapshotWriter for one solver
+
+    def __init__(self, directory, solverNum=0):
+        with open(os.path.join(directory, "solver{:d}.json".format(solverNum))) as f:
+            self.header = json.load(f)
+        self.nodes = self.header["nodes"]
+        index = np.load(os.path.join(directory, "solver{:d}_index.npy".format(solverNum)), mmap_mode='r')
+
+        # while a run is still writing (or after it crashed) the fields written are the ones with a step
+        self.count = self.header["count"]
+        if self.count is None:
+            self.count = int(np.count_nonzero(index['step'] >= 0))
+        self.times = np.array(index['time'][:self.count])
+        self.steps = np.array(index['step'][:self.count], dtype=int)
+
+        if self.count == 0:
+            self.fields = np.zeros((0, self.nodes, self.nodes))
+            return
+        self.fields = np.memmap(os.path.join(directory, "solver{:d}.dat".format(solverNum)), dtype=self.header["dtype"],
+                                mode='r', shape=(self.count, self.nodes, self.nodes))
+
+    def between(self, startTime, endTime):
+        # times and fields with startTime <= time <= endTime, the fields are a view into the file
+        start = np.searchsorted(self.times, startTime, side='left')
+        end = np.searchsorted(self.times, endTime, side='right')
+        return self.times[start:end], self.fields[start:end]
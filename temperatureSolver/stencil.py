@@ -0,0 +1,25 @@
+import numpy as np
+
+# 1D parts of the 5 point stencil of Heat2d.calculateHeatEquationNumpy, shared by the implicit solvers
+
+
+def diagonalX(solver):
+    # diagonal of the second difference in x (off diagonals are all 1)
+    # the interface row is scaled by the averaged alpha like Tx in the explicit update
+    diagX = np.full(solver.nodes, -2.0)
+    if solver.xNum == 0:
+        diagX[-1] = -(1 + solver.alphaAvgNext)
+        # flux BC: the ghost row is boundaryValue + T[0, :], so T[0, :] couples into itself
+        if solver.boundaryType == 'flux':
+            diagX[0] += 1
+    else:
+        diagX[0] = -(1 + solver.alphaAvgPrev)
+    return diagX
+
+
+def diagonalY(nodes):
+    # diagonal of the second difference in y, zero flux at top and bottom (ghost column equal to the edge column)
+    diagY = np.full(nodes, -2.0)
+    diagY[0] = -1
+    diagY[-1] = -1
+    return diagY
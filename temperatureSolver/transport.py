@@ -0,0 +1,220 @@
+from mpi4py import MPI
+import numpy as np
+import collections
+import asyncio
+import zlib
+
+
+# Ways of moving the interface rows between neighbouring solvers, used by temperatureSolver.mui.MUI.
+# A transport has start(fields, time) and finish(tags, time) for a batched exchange of several fields
+# (see MUI.exchange), pushLeft/pushRight(vals, time, data) and fetchRightPrev/fetchLeftNext(time, data)
+# with the same meaning as the MUI methods, and retainedFrames() with the number of the neighbours' frames still held for every side.
+
+
+def loopRunning():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class MUITransport:
+    # push_many/fetch_many through the mui unifaces. The spatial sampler maps the rows onto each other,
+    # so this is the one to use when the solvers have different mesh resolutions.
+
+    def __init__(self, mui, memory=('frames', 10)):
+        # memory bounds how much of the neighbours' data the unifaces hold on to:
+        #   ('frames', K)      -> the last K fetched frames, older ones are forgotten in one go every K fetches
+        #   ('window', length) -> frames within length of the newest one, mui drops the rest itself (set_memory)
+        # Either way it only depends on the times actually fetched, not on dt.
+        self.mui = mui
+        self.memoryPolicy, self.memoryLength = memory
+        if self.memoryPolicy not in ('frames', 'window'):
+            raise ValueError('Interface memory can be kept by \'frames\' or \'window\', not ' + str(self.memoryPolicy) + ".")
+        if self.memoryLength <= 0:
+            raise ValueError("Interface memory has to be positive, not {}.".format(self.memoryLength))
+
+        sides = []
+        if mui.solverNum != 0:
+            sides.append('left')
+        if mui.solverNum != mui.numSolvers-1:
+            sides.append('right')
+        # times of the frames fetched from each side that the uniface still holds, oldest first
+        self.frameTimes = {side: collections.deque() for side in sides}
+        # prepared push_many/fetch_many handles per (side, data), see getPush and getFetch
+        self.pushes = {}
+        self.fetches = {}
+        # the fetched values are written into these instead of a new array every step (valid until the next fetch)
+        self.receiveBuffers = {}
+        # a solver with neighbours on both sides waits for them together, each uniface on its own waiter thread
+        # (see fetchAsync), which needs MPI to allow calls from several threads at once
+        self.concurrentFetches = len(sides) > 1 and MPI.Query_thread() == MPI.THREAD_MULTIPLE
+        self.loop = None
+
+        if self.memoryPolicy == 'window':
+            for side in sides:
+                self.getUniface(side).set_memory(self.memoryLength)
+
+    def getUniface(self, side):
+        return self.mui.leftUniface if side == 'left' else self.mui.rightUniface
+
+    def getPush(self, side, data):
+        # the C++ function is looked up the first time, later pushes call it straight away
+        if (side, data) not in self.pushes:
+            self.pushes[(side, data)] = self.getUniface(side).prepare_push_many(data)
+        return self.pushes[(side, data)]
+
+    def getFetch(self, side, data):
+        if (side, data) not in self.fetches:
+            self.fetches[(side, data)] = self.getUniface(side).prepare_fetch_many(data, self.mui.s_sampler, self.mui.t_sampler)
+        return self.fetches[(side, data)]
+
+    def getReceiveBuffer(self, side, data):
+        if (side, data) not in self.receiveBuffers:
+            self.receiveBuffers[(side, data)] = np.zeros(self.mui.nodes)
+        return self.receiveBuffers[(side, data)]
+
+    def forgetFrames(self, side, time):
+        times = self.frameTimes[side]
+        times.append(time)
+        if self.memoryPolicy == 'window':
+            while times[0] <= time - self.memoryLength:
+                times.popleft()
+        elif len(times) == 2*self.memoryLength:
+            self.getUniface(side).forget(times[self.memoryLength-1])
+            for frame in range(self.memoryLength):
+                times.popleft()
+
+    def retainedFrames(self):
+        return {side: len(times) for side, times in self.frameTimes.items()}
+
+    def start(self, fields, time):
+        # every field is pushed before the single commit per neighbour
+        for side, values in fields.items():
+            for data, vals in values.items():
+                self.getPush(side, data)(self.mui.points, vals)
+            self.getUniface(side).commit( time )
+
+    def finish(self, tags, time):
+        # a loop that is already running (e.g. the solver is driven from a coroutine) can't be run again
+        # from inside, so then the fetches are done one after the other
+        if self.concurrentFetches and len(tags) > 1 and not loopRunning():
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+            fetched = self.loop.run_until_complete(self.fetchAsync(tags, time))
+        else:
+            # only the first fetch waits for the neighbour's commit, the other fields came with it
+            fetched = {side: {data: self.getFetch(side, data)(self.mui.points, time, out=self.getReceiveBuffer(side, data))
+                              for data in sideTags}
+                       for side, sideTags in tags.items()}
+        for side in tags:
+            self.forgetFrames(side, time)
+        return fetched
+
+    async def fetchSideAsync(self, side, sideTags, time):
+        uniface = self.getUniface(side)
+        fetched = {}
+        for data in sideTags:
+            fetched[data] = await uniface.run_async(self.getFetch(side, data), self.mui.points, time,
+                                                    out=self.getReceiveBuffer(side, data))
+        return fetched
+
+    async def fetchAsync(self, tags, time):
+        # the left and right fetches are awaited together, so the waits for the two neighbours overlap
+        sides = list(tags)
+        fetched = await asyncio.gather(*(self.fetchSideAsync(side, tags[side], time) for side in sides))
+        return dict(zip(sides, fetched))
+
+    def pushRight(self, vals, time, data="temp"):
+        self.start({'right': {data: vals}}, time)
+
+    def pushLeft(self, vals, time, data="temp"):
+        self.start({'left': {data: vals}}, time)
+
+    def fetchRightPrev(self, time, data="temp"):
+        return self.finish({'left': [data]}, time)['left'][data]
+
+    def fetchLeftNext(self, time, data="temp"):
+        return self.finish({'right': [data]}, time)['right'][data]
+
+
+
+class MPITransport:
+    # Plain one row halo exchange with persistent point to point requests, only for solvers that all have
+    # the same number of nodes. There are no samplers, points or commits: a push copies the row into a
+    # send buffer and starts the send together with the receive from the same neighbour, the fetch waits
+    # for both and hands back the receive buffer itself (valid until the next push to that side).
+    # Messages between two ranks arrive in order, so the time is not needed to match them up.
+    # On a grid of solvers the columns shared with the solvers below and above go the same way.
+
+    def __init__(self, comm, neighbours, nodes):
+        # neighbours maps 'left', 'right', 'below' and 'above' to the rank on that side, if there is one
+        self.comm = comm
+        self.nodes = nodes
+        self.neighbours = neighbours
+
+        # (side, data) -> (send buffer, receive buffer, [send request, receive request])
+        self.channels = {}
+
+    def getChannel(self, side, data):
+        # created the first time a field is exchanged with that neighbour
+        if (side, data) not in self.channels:
+            neighbour = self.neighbours[side]
+            # derived from the name so both ranks agree on it whatever order the fields are first used in
+            tag = zlib.crc32(data.encode()) % 32768
+            sendBuffer = np.zeros(self.nodes)
+            receiveBuffer = np.zeros(self.nodes)
+            requests = [self.comm.Send_init([sendBuffer, MPI.DOUBLE], neighbour, tag),
+                        self.comm.Recv_init([receiveBuffer, MPI.DOUBLE], neighbour, tag)]
+            self.channels[(side, data)] = (sendBuffer, receiveBuffer, requests)
+        return self.channels[(side, data)]
+
+    def start(self, fields, time):
+        # the sends and receives of every field and neighbour are started together
+        requests = []
+        for side, values in fields.items():
+            for data, vals in values.items():
+                sendBuffer, receiveBuffer, channelRequests = self.getChannel(side, data)
+                np.copyto(sendBuffer, vals)
+                requests += channelRequests
+        MPI.Prequest.Startall(requests)
+
+    def finish(self, tags, time):
+        channels = {side: {data: self.getChannel(side, data) for data in sideTags} for side, sideTags in tags.items()}
+        MPI.Prequest.Waitall([request for sideChannels in channels.values()
+                              for sendBuffer, receiveBuffer, requests in sideChannels.values() for request in requests])
+        return {side: {data: channel[1] for data, channel in sideChannels.items()} for side, sideChannels in channels.items()}
+
+    def push(self, side, data, vals):
+        self.start({side: {data: vals}}, None)
+
+    def fetch(self, side, data):
+        return self.finish({side: [data]}, None)[side][data]
+
+    def pushRight(self, vals, time, data="temp"):
+        self.push('right', data, vals)
+
+    def pushLeft(self, vals, time, data="temp"):
+        self.push('left', data, vals)
+
+    def fetchRightPrev(self, time, data="temp"):
+        return self.fetch('left', data)
+
+    def fetchLeftNext(self, time, data="temp"):
+        return self.fetch('right', data)
+
+    def pushBelow(self, vals, time, data="temp"):
+        self.push('below', data, vals)
+
+    def pushAbove(self, vals, time, data="temp"):
+        self.push('above', data, vals)
+
+    def fetchTopBelow(self, time, data="temp"):
+        return self.fetch('below', data)
+
+    def fetchBottomAbove(self, time, data="temp"):
+        return self.fetch('above', data)
+
+    def retainedFrames(self):
+        return {side: 0 for side in self.neighbours}
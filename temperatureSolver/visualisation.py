@@ -0,0 +1,159 @@
+import numpy as np
+import atexit
+import os
+import queue
+import threading
+import time as timer
+
+
+class Visualisation:
+    # Colour map of T and the temperature profile plot of a Heat2d solver.
+    # matplotlib is only imported when one of these is created, so runs that never plot don't load it.
+    # With headless=True the figures are drawn on an Agg canvas (no display and no pyplot state)
+    # and written as png files to frameDir instead of being shown.
+
+    def __init__(self, solver, headless=False, frameDir='frames', vmin=0, vmax=100):
+        self.solver = solver
+        self.headless = headless
+        self.frameDir = frameDir
+        self.frameCount = 0
+
+        if headless:
+            os.makedirs(frameDir, exist_ok=True)
+            self.plt = None
+        else:
+            import matplotlib.pyplot as plt
+            self.plt = plt
+
+        self.figure, self.axis = self.createFigure()
+        self.pcm = self.axis.pcolormesh(solver.T, cmap='jet', vmin=vmin, vmax=vmax)
+        self.figure.colorbar(self.pcm, ax=self.axis)
+
+        # draw gridlines
+        #self.axis.grid(which='major', axis='both', linestyle='-', color='0.8', linewidth=0.5)
+        #self.axis.set_xticks(np.arange(0, solver.nodes, 1))
+        #self.axis.set_yticks(np.arange(0, solver.nodes, 1))
+
+    def createFigure(self):
+        if self.headless:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            figure = Figure()
+            FigureCanvasAgg(figure)
+            return figure, figure.subplots()
+        return self.plt.subplots()
+
+    def setColorMapScale(self, min, max):
+        self.pcm.set_clim(min, max)
+
+    def drawFrame(self, T, time):
+        self.pcm.set_array(T.T)
+        self.axis.set_title("Temperature at time t: {:.3f}s".format(time))
+        if self.headless:
+            self.save(self.figure, "frame{:06d}".format(self.frameCount))
+            self.frameCount += 1
+        else:
+            self.plt.pause(0.005)
+
+    def save(self, figure, name):
+        # one file per solver so MPI ranks can share frameDir
+        figure.savefig(os.path.join(self.frameDir, "solver{:d}_{}.png".format(self.solver.solverNum, name)))
+
+    def plotTemperature(self, T, time):
+        solver = self.solver
+        self.pcm.set_array(T.T)
+        self.axis.set_title("Temperature at time t: {:.3f}s".format(time))
+
+        figure, ax = self.createFigure()
+
+        xRange = np.linspace(solver.xNum*solver.width, (solver.xNum+1)*solver.width, solver.nodes)
+        tempData = np.average(T, axis=1)
+
+        slope, intercept = np.polyfit(xRange, tempData, 1)
+
+        ax.plot(xRange, tempData)
+        ax.set_xlabel("x (m)")
+        ax.set_ylabel("Temp (K)")
+        ax.set_title("Temp from Solver {:d}. Equation of line: T = {:.3f}x + {:.2f}".format(solver.solverNum, slope, intercept))
+
+        if self.headless:
+            self.save(self.figure, "colorMap")
+            self.save(figure, "graph")
+        else:
+            self.plt.show()
+
+
+class AsyncFrameWriter:
+    # Renders the frames of a headless Visualisation on a background thread so drawing doesn't stall the solver.
+    # Snapshots of T go through a bounded pool of preallocated buffers: drawFrame only copies T into a
+    # free buffer and queues it, and if the renderer is behind (no free buffer) the frame is dropped.
+    # The renderer draws at most frameRate frames per second.
+    # Only headless output is supported, matplotlib windows have to be driven from the main thread.
+
+    def __init__(self, visualisation, frameRate=10, maxQueued=2):
+        if not visualisation.headless:
+            raise ValueError("Asynchronous frames can only be written by a headless visualisation.")
+
+        self.visualisation = visualisation
+        self.headless = True
+        self.frameInterval = 1/frameRate
+        self.framesDropped = 0
+        self.framesWritten = 0
+
+        nodes = visualisation.solver.nodes
+        self.freeBuffers = queue.Queue()
+        for i in range(maxQueued):
+            self.freeBuffers.put(np.zeros((nodes, nodes)))
+        self.frames = queue.Queue()
+
+        # the renderer and the solver thread both use the figure
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.render, daemon=True)
+        self.thread.start()
+        # queued frames are still written if the script ends without calling close
+        atexit.register(self.close)
+
+    def render(self):
+        lastFrame = 0.0
+        while True:
+            frame = self.frames.get()
+            if frame is None:
+                break
+            buffer, time = frame
+            wait = lastFrame + self.frameInterval - timer.perf_counter()
+            if wait > 0:
+                timer.sleep(wait)
+            lastFrame = timer.perf_counter()
+            with self.lock:
+                self.visualisation.drawFrame(buffer, time)
+            self.framesWritten += 1
+            self.freeBuffers.put(buffer)
+            self.frames.task_done()
+        self.frames.task_done()
+
+    def drawFrame(self, T, time):
+        try:
+            buffer = self.freeBuffers.get_nowait()
+        except queue.Empty:
+            self.framesDropped += 1
+            return
+        np.copyto(buffer, T)
+        self.frames.put((buffer, time))
+
+    def flush(self):
+        # wait for the queued frames to be written
+        self.frames.join()
+
+    def close(self):
+        if self.thread.is_alive():
+            self.frames.put(None)
+            self.thread.join()
+
+    def setColorMapScale(self, min, max):
+        with self.lock:
+            self.visualisation.setColorMapScale(min, max)
+
+    def plotTemperature(self, T, time):
+        self.flush()
+        with self.lock:
+            self.visualisation.plotTemperature(T, time)